@@ -1,14 +1,27 @@
+# Taken before the heavy imports to report startup time in batch mode
+import time
+START_TIME = time.perf_counter()
+
+import argparse
+import functools
+import glob
 import json
 import logging
 import os
 import re
 import sys
-import traceback
 from enum import Enum
-from numpy import float32
-from ue4 import FName, FPackageReader, FString
+from numpy import ndarray
+from ue4 import FName, PackageCache, open_package
 from ue4.properties import UProperty, UArrayProperty, UObjectProperty
 from ue4.properties import UStructProperty
+from ue4.incremental import DependencyLog, run_incremental_jobs
+from ue4.incremental import source_files
+from ue4.jobs import job_count, run_jobs
+from ue4.output import OUTPUT_EXTENSIONS, json_output_default, msgpack
+from ue4.output import msgpack_packer, round_float32, struct_array_rows
+from ue4.package import package_files
+from ue4.structs import FStructArray
 
 GAME_PATH_RE = re.compile(r"((?:.*[/\\]|^)(?:[Gg]ame[/\\]|[Cc]ontent[/\\]))(.*)")
 
@@ -17,71 +30,102 @@ def get_asset_path(path):
     match = GAME_PATH_RE.match(os.path.abspath(path))
     return match.group(2) if match else os.path.basename(path)
 
-def get_output_path(path):
+def get_output_path(path, format="json"):
     """Generate an output path."""
     return os.path.join(os.path.dirname(os.path.realpath(__file__)),
                         "output",
-                        f"{os.path.splitext(get_asset_path(path))[0]}.json")
+                        os.path.splitext(get_asset_path(path))[0] +
+                        OUTPUT_EXTENSIONS[format])
+
+DEPENDENCY_LOG_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                   "output", ".dependencies.json")
 
-def read_package(reader):
-    for i, name in enumerate(reader.NameTable):
-        logging.debug(f"Name {i}: {name}")
+def package_exports(reader, exports=None):
+    """
+    Get the indexes of every export, or of only the given export
+    indexes/names, keyed by their declaration.
+    """
+    if reader.Trace:
+        for i, name in enumerate(reader.NameTable):
+            logging.debug(f"Name {i}: {name}")
 
-    for i in range(len(reader.ExportTable)):
-        logging.debug(f"Export {i}: {reader.GetObjectDeclName(i + 1)}")
+        for i in range(len(reader.ExportTable)):
+            logging.debug(f"Export {i}: {reader.GetObjectDeclName(i + 1)}")
 
-    for i in range(len(reader.ImportTable)):
-        logging.debug(f"Import {i}: {reader.GetObjectDeclName(-i - 1)}")
+        for i in range(len(reader.ImportTable)):
+            logging.debug(f"Import {i}: {reader.GetObjectDeclName(-i - 1)}")
 
-    objects = {}
-    for i, export in enumerate(reader.ExportTable):
-        reader.seek(export.SerialOffset)
-        logging.debug(f"Export {reader.GetObjectFullName(i + 1)} @ "
-                      f"{reader.offset_string()} size {export.SerialSize:08X}")
-        obj = UStructProperty(reader)
+    if exports is None:
+        exports = range(1, len(reader.ExportTable) + 1)
+    else:
+        exports = [i if isinstance(i, int) else reader.FindExport(i)
+                   for i in exports]
 
-        if reader.GetObjectName(export.ClassIndex) == "DataTable":
-            reader.s32()
-            NumRows = reader.s32()
-            obj.RowMap = {FName(reader): UStructProperty(reader)
-                          for _ in range(NumRows)}
+    # Same order and values as a dict of every export would have
+    return {reader.GetObjectDeclName(i): i for i in exports if i != 0}
 
-        if reader.GetObjectName(export.ClassIndex) == "StringTable":
-            reader.s32()
-            Name = FString(reader)
-            NumEntries = reader.s32()
-            obj = {FString(reader): FString(reader)
-                   for _ in range(NumEntries)}
+def iter_package(reader, exports=None, memoize=True):
+    """
+    Deserialize every export, or only the given export indexes/names, one at
+    a time. Yields each export with its declaration. Without memoize the
+    reader doesn't keep exports, so each can be freed once it was used.
+    """
+    for decl, i in package_exports(reader, exports).items():
+        yield decl, reader.ReadExport(i, memoize)
 
-        objects[reader.GetObjectDeclName(i + 1)] = obj
+def read_package(reader, exports=None):
+    """
+    Deserialize every export, or only the given export indexes/names. Returns
+    a dict of the exports keyed by their declaration.
+    """
+    return dict(iter_package(reader, exports))
 
-    return objects
+def write_objects(f, objects, default):
+    """
+    Write (key, value) pairs as a JSON object, byte for byte as
+    json.dump(dict(objects), f, default=default, indent=4) would, but
+    serializing and writing one value at a time.
+    """
+    encoder = json.JSONEncoder(default=default, indent=4)
+    separator = "{\n    "
+    for key, value in objects:
+        f.write(f"{separator}{json.dumps(key)}: ")
+        for chunk in encoder.iterencode(value):
+            f.write(chunk.replace("\n", "\n    "))
+        separator = ",\n    "
+    f.write("{}" if separator == "{\n    " else "\n}")
 
-def dump_asset(path):
+def write_msgpack_objects(f, objects, count, default):
+    """
+    Write count (key, value) pairs as a MessagePack map, serializing and
+    writing one value at a time.
+    """
+    packer = msgpack_packer(default)
+    f.write(packer.pack_map_header(count))
+    for key, value in objects:
+        f.write(packer.pack(key))
+        f.write(packer.pack(value))
+
+def dump_asset(path, cache=None, format="json"):
+    """
+    Dump a package to JSON or MessagePack, returning the files it was read
+    from.
+    """
     try:
-        with open(path, "rb") as f:
-            data = f.read()
-    except (OSError, IOError):
-        print(f"Unable to open \"{path}\"", file=sys.stderr)
+        if cache is not None:
+            reader = cache.open_package(path)
+        else:
+            reader = open_package(path)
+    except (OSError, IOError) as exception:
+        print(f"Unable to open \"{exception.filename}\"", file=sys.stderr)
         return
 
-    uexp_offset = None
-    root, ext = os.path.splitext(path)
-
-    if ext == ".uasset":
-        uexp = f"{root}.uexp"
-        if os.path.exists(uexp):
-            uexp_offset = len(data)
-            try:
-                with open(uexp, "rb") as f:
-                    data += f.read()
-            except (OSError, IOError):
-                print(f"Unable to open \"{uexp}\"", file=sys.stderr)
-                return
+    out_path = get_output_path(path, format)
 
-    out_path = get_output_path(path)
-    reader = FPackageReader(data, uexp_offset)
-    objects = read_package(reader)
+    # Exports are written as they are read and dropped afterwards
+    decls = package_exports(reader)
+    objects = ((decl, reader.ReadExport(i, memoize=False))
+               for decl, i in decls.items())
 
     def json_default(obj):
         if isinstance(obj, Enum):
@@ -95,13 +139,17 @@ def dump_asset(path):
             return json_default(obj.Data)
         elif isinstance(obj, UArrayProperty):
             return json_default(obj.elems)
+        elif isinstance(obj, FStructArray):
+            return struct_array_rows(obj)
         elif isinstance(obj, UObjectProperty):
             return reader.GetObjectFullName(obj.Index)
         elif isinstance(obj, UStructProperty):
             return json_default(obj.fields)
         elif isinstance(obj, float):
-            return next((r for r in (round(obj, n) for n in range(10))
-                                if float32(obj) == float32(r)), obj)
+            return round_float32(obj)
+        elif isinstance(obj, ndarray):
+            # Left to the output format
+            return obj
         elif isinstance(obj, dict):
             return {json_default(k): json_default(v) for k, v in obj.items()}
         elif hasattr(obj, "__dict__"):
@@ -109,31 +157,128 @@ def dump_asset(path):
         else:
             return obj
 
+    # Written to a temporary file first so that a failed export doesn't leave
+    # a partial output behind
+    temp_path = f"{out_path}.tmp"
     try:
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        with open(out_path, "w") as f:
-            json.dump(objects, f, default=json_default, indent=4)
-        print(f"Wrote to \"{out_path}\"")
+        f = open(temp_path, "w" if format == "json" else "wb")
     except (OSError, IOError):
         print(f"Unable to open output file \"{out_path}\"", file=sys.stderr)
+        return
+
+    try:
+        with f:
+            if format == "json":
+                write_objects(f, objects, json_output_default(json_default))
+            else:
+                write_msgpack_objects(f, objects, len(decls), json_default)
+        os.replace(temp_path, out_path)
+    except (OSError, IOError):
+        print(f"Unable to open output file \"{out_path}\"", file=sys.stderr)
+        return
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    print(f"Wrote to \"{out_path}\"")
+
+    return package_files(path)
+
+def read_manifest(file, root):
+    """
+    Expand a manifest of globs ("**" matches any number of directories) or
+    directories, one per line relative to root, into .uasset/.umap paths.
+    Blank lines and lines starting with # are ignored, and entries that
+    match nothing are warned about. Returns the expanded paths and the number
+    of manifest entries.
+    """
+    paths = []
+    entries = 0
+
+    for line in file:
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+
+        entries += 1
+        pattern = os.path.join(root, line)
+
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*")
+
+        matches = sorted(path for path in glob.glob(pattern, recursive=True)
+                         if os.path.splitext(path)[1] in [".uasset", ".umap"])
+        if not matches:
+            print(f"No packages match manifest entry \"{line}\"",
+                  file=sys.stderr)
+        paths += matches
+
+    return paths, entries
 
 def main():
+    startup_time = time.perf_counter() - START_TIME
+
+    parser = argparse.ArgumentParser(
+        description="Dump packages to JSON or MessagePack.")
+    parser.add_argument("paths", nargs="*", metavar="uasset")
+    parser.add_argument("-j", "--jobs", type=job_count, default=1,
+                        help="number of packages to dump in parallel, "
+                             "0 for one per core")
+    parser.add_argument("-t", "--trace", action="store_true",
+                        help="log every property with its package offset")
+    parser.add_argument("-m", "--manifest", type=argparse.FileType("r"),
+                        help="file listing globs/directories to dump, "
+                             "- for stdin")
+    parser.add_argument("-r", "--root", default=".",
+                        help="directory manifest entries are relative to")
+    parser.add_argument("-c", "--cache", metavar="DIR",
+                        help="directory to cache parsed packages in, "
+                             "which reads every export of a package up "
+                             "front instead of as it is dumped")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="only dump packages that changed since the "
+                             "last incremental run")
+    parser.add_argument("-f", "--format", choices=OUTPUT_EXTENSIONS,
+                        default="json", help="output format "
+                                             "(default: %(default)s)")
+    args = parser.parse_args()
+
     logging.basicConfig(format="%(levelname)s: %(message)s",
-                        level=logging.INFO)
+                        level=logging.DEBUG if args.trace else logging.INFO)
 
-    if len(sys.argv) < 2:
-        print("Usage: asset_dump.py <uasset 1> <uasset 2> ...", file=sys.stderr)
-        return
+    if not args.paths and args.manifest is None:
+        parser.error("no packages or manifest given")
+    if args.format == "msgpack" and msgpack is None:
+        parser.error("msgpack is needed for --format msgpack")
 
-    for path in sys.argv[1:]:
-        if path.endswith(".uexp"):
-            continue
+    paths = args.paths
+    if args.manifest is not None:
+        manifest_paths, entries = read_manifest(args.manifest, args.root)
+        paths = paths + manifest_paths
+
+    # Dump each package once even if several entries match it
+    unique = {}
+    for path in paths:
+        if not path.endswith(".uexp"):
+            unique.setdefault(os.path.realpath(path), path)
+    paths = list(unique.values())
+
+    cache = PackageCache(args.cache) if args.cache else None
+    dump = functools.partial(dump_asset, cache=cache, format=args.format)
+    if args.incremental:
+        log = DependencyLog(DEPENDENCY_LOG_PATH, [__file__, *source_files()])
+        output_path = functools.partial(get_output_path, format=args.format)
+        run_incremental_jobs(dump, paths, output_path, log, args.jobs)
+    else:
+        run_jobs(dump, paths, args.jobs)
 
-        try:
-            dump_asset(path)
-        except:
-            print(f"Exception while processing {os.path.basename(path)}:")
-            traceback.print_exc()
+    if args.manifest is not None:
+        total_time = time.perf_counter() - START_TIME
+        # Scripts calling this once per entry are the worst case, so this
+        # is only an upper bound of the time saved
+        print(f"Dumped {len(paths)} packages from {entries} manifest entries "
+              f"in {total_time:.2f}s (startup {startup_time:.2f}s, at most "
+              f"{startup_time * max(entries - 1, 0):.2f}s saved versus one "
+              f"process per entry)")
 
 if __name__ == "__main__":
     main()
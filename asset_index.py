@@ -0,0 +1,226 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from ue4 import open_package_header
+from ue4.jobs import job_count, run_jobs
+
+DATABASE_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                             "asset_index.db")
+
+# Bump whenever the schema or what gets indexed changes, which rebuilds it
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    file TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exports (
+    package INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    class TEXT NOT NULL,
+    object_path TEXT NOT NULL,
+    super TEXT
+);
+CREATE TABLE IF NOT EXISTS imports (
+    package INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    class TEXT NOT NULL,
+    object_path TEXT NOT NULL,
+    object_package TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packages_path ON packages (path);
+CREATE INDEX IF NOT EXISTS exports_package ON exports (package);
+CREATE INDEX IF NOT EXISTS exports_name ON exports (name);
+CREATE INDEX IF NOT EXISTS exports_class ON exports (class);
+CREATE INDEX IF NOT EXISTS imports_package ON imports (package);
+CREATE INDEX IF NOT EXISTS imports_name ON imports (name);
+CREATE INDEX IF NOT EXISTS imports_object_package ON imports (object_package);
+"""
+
+def get_package_path(root, path):
+    """
+    Get the /Game/ path of a package file under a Content root. A .uasset
+    and a .umap with the same name share it, so packages are keyed by file.
+    """
+    relpath = os.path.splitext(os.path.relpath(path, root))[0]
+    return "/Game/" + relpath.replace(os.sep, "/")
+
+def find_packages(root):
+    """Find every .uasset/.umap under root."""
+    for directory, _, files in os.walk(root):
+        for file in sorted(files):
+            if os.path.splitext(file)[1] in [".uasset", ".umap"]:
+                yield os.path.join(directory, file)
+
+def scan_package(path):
+    """
+    Read the export and import tables of a package without deserializing
+    any exports. Returns the export and import rows.
+    """
+    reader = open_package_header(path)
+
+    exports = []
+    for i, export in enumerate(reader.ExportTable, 1):
+        super_path = (reader.GetObjectPath(export.SuperIndex)
+                      if export.SuperIndex != 0 else None)
+        exports.append((i, str(export.ObjectName),
+                        reader.GetObjectName(export.ClassIndex),
+                        reader.GetObjectPath(i), super_path))
+
+    imports = []
+    for i, entry in enumerate(reader.ImportTable, 1):
+        imports.append((i, str(entry.ObjectName), str(entry.ClassName),
+                        reader.GetObjectPath(-i), reader.GetObjectPackage(-i)))
+
+    return exports, imports
+
+def open_database(path):
+    db = sqlite3.connect(path)
+    if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        for table in ["packages", "exports", "imports"]:
+            db.execute(f"DROP TABLE IF EXISTS {table}")
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+def delete_package(db, id):
+    db.execute("DELETE FROM exports WHERE package = ?", (id,))
+    db.execute("DELETE FROM imports WHERE package = ?", (id,))
+    db.execute("DELETE FROM packages WHERE id = ?", (id,))
+
+def build_index(db, root, jobs=1):
+    """
+    Index every package under a Content root. Packages whose .uasset size
+    and mtime are unchanged since the last build are not read again, and
+    packages that no longer exist are dropped.
+    """
+    start_time = time.perf_counter()
+    root = os.path.realpath(root)
+
+    indexed = {file: (id, size, mtime) for id, file, size, mtime
+               in db.execute("SELECT id, file, size, mtime FROM packages")}
+
+    stale = []
+    stats = {}
+    for path in find_packages(root):
+        file = os.path.realpath(path)
+        stat = os.stat(file)
+        stats[file] = (stat.st_size, stat.st_mtime_ns)
+        if file in indexed and indexed[file][1:] == stats[file]:
+            continue
+        stale.append(file)
+
+    with db:
+        stale_files = set(stale)
+        for file, (id, _, _) in indexed.items():
+            if file not in stats or file in stale_files:
+                delete_package(db, id)
+
+        for file, tables in zip(stale, run_jobs(scan_package, stale, jobs)):
+            if tables is None:
+                # Left out so the next build tries it again
+                continue
+
+            exports, imports = tables
+            size, mtime = stats[file]
+            id = db.execute(
+                "INSERT INTO packages (path, file, size, mtime) "
+                "VALUES (?, ?, ?, ?)",
+                (get_package_path(root, file), file, size, mtime)).lastrowid
+            db.executemany("INSERT INTO exports VALUES (?, ?, ?, ?, ?, ?)",
+                           [(id, *row) for row in exports])
+            db.executemany("INSERT INTO imports VALUES (?, ?, ?, ?, ?, ?)",
+                           [(id, *row) for row in imports])
+
+    removed = len([file for file in indexed if file not in stats])
+    print(f"Indexed {len(stale)} packages, {len(stats) - len(stale)} "
+          f"unchanged, {removed} removed in "
+          f"{time.perf_counter() - start_time:.2f}s")
+
+def find_references(db, name):
+    """
+    Find imports of an object or package, matched by object name, full
+    package path or the last part of the package path.
+    """
+    return db.execute(
+        "SELECT packages.path, imports.class, imports.object_path "
+        "FROM imports "
+        "JOIN packages ON packages.id = imports.package "
+        "WHERE imports.name = ?1 OR imports.object_package = ?1 "
+        "OR imports.object_package GLOB '*/' || ?1 "
+        "ORDER BY packages.path, imports.idx", (name,)).fetchall()
+
+def find_exports(db, class_name=None, path=None, name=None):
+    """
+    Find exports by class name, package path glob (e.g. "/Game/*/Guns/*")
+    and/or export name.
+    """
+    conditions = []
+    params = []
+    for column, value in [("exports.class = ?", class_name),
+                          ("packages.path GLOB ?", path),
+                          ("exports.name = ?", name)]:
+        if value is not None:
+            conditions.append(column)
+            params.append(value)
+
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return db.execute(
+        "SELECT packages.path, exports.object_path, exports.class, "
+        "exports.super FROM exports "
+        "JOIN packages ON packages.id = exports.package "
+        f"{where}ORDER BY packages.path, exports.idx", params).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index the exports and imports of a Content tree.")
+    parser.add_argument("-d", "--database", default=DATABASE_PATH,
+                        help="index database (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="scan a Content directory")
+    build.add_argument("root", help="Content (Game) directory")
+    build.add_argument("-j", "--jobs", type=job_count, default=1,
+                       help="number of packages to read in parallel, "
+                            "0 for one per core")
+
+    refs = commands.add_parser("refs",
+                               help="list packages importing an object")
+    refs.add_argument("name", help="object name or package path/name, "
+                                   "e.g. Comp_Gun_Stability")
+
+    exports = commands.add_parser("exports", help="list exports")
+    exports.add_argument("-c", "--class", dest="class_name",
+                         help="class name, e.g. BlueprintGeneratedClass")
+    exports.add_argument("-p", "--path",
+                         help="package path glob, e.g. '/Game/*/Guns/*'")
+    exports.add_argument("-n", "--name", help="export name")
+
+    args = parser.parse_args()
+
+    db = open_database(args.database)
+
+    if args.command == "build":
+        if not os.path.isdir(args.root):
+            print(f"No such directory \"{args.root}\"", file=sys.stderr)
+            sys.exit(1)
+        build_index(db, args.root, args.jobs)
+    elif args.command == "refs":
+        for package, class_name, object_path in find_references(db, args.name):
+            print(f"{package}: {class_name} {object_path}")
+    elif args.command == "exports":
+        for package, object_path, class_name, super_path in \
+                find_exports(db, args.class_name, args.path, args.name):
+            suffix = f" : {super_path}" if super_path is not None else ""
+            print(f"{package}: {class_name} {object_path}{suffix}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,15 +1,22 @@
+import argparse
+import functools
 import json
 import logging
 import os
 import re
 import sys
-import traceback
 from enum import Enum
-from numpy import float32
-from ue4 import FName, FPackageReader
+from numpy import ndarray
+from ue4 import FName, PackageCache, open_package
 from ue4.properties import UProperty, UArrayProperty, UObjectProperty
 from ue4.properties import UStructProperty
-from ue4.structs import STRUCT_TYPE_MAP
+from ue4.incremental import DependencyLog, run_incremental_jobs
+from ue4.incremental import source_files
+from ue4.jobs import job_count, run_jobs
+from ue4.output import OUTPUT_EXTENSIONS, json_output_default, msgpack
+from ue4.output import msgpack_packer, round_float32, struct_array_rows
+from ue4.package import package_files
+from ue4.structs import STRUCT_TYPE_MAP, FStructArray
 from ue4.structs import ERichCurveInterpMode as RCIM
 from ue4.structs import ERichCurveTangentMode as RCTM
 from ue4.structs import ERichCurveTangentWeightMode as RCTWM
@@ -30,62 +37,58 @@ def get_gun_path(path):
         return match.group(2)
     return os.path.basename(path)
 
-def get_output_path(path):
+def get_output_path(path, format="json"):
     """Generate an output path."""
     return os.path.join(os.path.dirname(os.path.realpath(__file__)),
                         "guns",
-                        f"{os.path.split(get_gun_path(path))[0]}.json")
+                        os.path.split(get_gun_path(path))[0] +
+                        OUTPUT_EXTENSIONS[format])
+
+DEPENDENCY_LOG_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                   "guns", ".dependencies.json")
 
 class AssetManager:
-    def __init__(self, game_path):
+    def __init__(self, game_path, cache=None):
         self.game_path = game_path
+        self.cache = cache
         self.package_cache = {}
         self.object_cache = {}
 
+        # Packages imports were resolved to that couldn't be opened
+        self.missing_packages = []
+
     def open_package(self, path):
         if path in self.package_cache:
             return self.package_cache[path]
 
-        with open(path, "rb") as f:
-            data = f.read()
-
-        uexp_offset = None
-        root, ext = os.path.splitext(path)
-
-        if ext == ".uasset":
-            uexp = f"{root}.uexp"
-            if os.path.exists(uexp):
-                uexp_offset = len(data)
-                with open(uexp, "rb") as f:
-                    data += f.read()
-
-        reader = FPackageReader(data, uexp_offset)
+        if self.cache is not None:
+            reader = self.cache.open_package(path)
+        else:
+            reader = open_package(path)
         self.package_cache[path] = reader
         self.object_cache[reader] = {}
-        self.visited = []
         return reader
 
     def read_export(self, reader, name):
         if name in self.object_cache[reader]:
             return self.object_cache[reader][name]
 
-        for i, export in enumerate(reader.ExportTable):
-            if export.ObjectName != name:
-                continue
+        if (index := reader.FindExport(name)) == 0:
+            return None
 
-            reader.seek(export.SerialOffset)
-            obj = UStructProperty(reader)
-            self.object_cache[reader][name] = obj
-            self.resolve_references(reader, obj)
+        export = reader.ExportTable[index - 1]
+        obj = reader.ReadExport(index)
+        self.object_cache[reader][name] = obj
+        self.resolve_references(reader, obj)
 
-            obj.name     = name
-            obj.default  = self.read_export(reader, f"Default__{name}")
-            obj.super    = self.read_object(reader, export.SuperIndex)[1]
-            obj.template = self.read_object(reader, export.TemplateIndex)[1]
+        obj.name     = name
+        obj.default  = self.read_export(reader, f"Default__{name}")
+        obj.super    = self.read_object(reader, export.SuperIndex)[1]
+        obj.template = self.read_object(reader, export.TemplateIndex)[1]
 
-            if obj.template is not obj and obj.template is not None:
-                return inherit_properties(obj, obj.template)
-            return obj
+        if obj.template is not obj and obj.template is not None:
+            return inherit_properties(obj, obj.template)
+        return obj
 
     def read_object(self, reader, index):
         entry = reader.ExIm(index)
@@ -99,29 +102,42 @@ class AssetManager:
                     pkg = self.open_package(os.path.join(self.game_path, path))
                     return (pkg, self.read_export(pkg, entry.ObjectName))
                 except IOError:
-                    pass
+                    self.missing_packages.append(path)
         return (None, None)
 
-    def resolve_references(self, reader, obj):
-        if obj in self.visited:
+    def resolve_references(self, reader, obj, visited=None):
+        """
+        Replace object properties in obj with the objects they reference.
+        visited maps id() to the containers already walked in this pass and
+        keeps them alive so that their ids can't be reused.
+        """
+        if isinstance(obj, UObjectProperty):
+            return self.read_object(reader, obj.Index)[1]
+
+        # Leaves and decoded primitive and struct arrays hold no references
+        if not isinstance(obj, (dict, list, UArrayProperty, UStructProperty,
+                                UProperty)):
             return obj
 
+        if visited is None:
+            visited = {}
+        elif id(obj) in visited:
+            return obj
+        visited[id(obj)] = obj
+
         if isinstance(obj, dict):
             for key in obj:
-                obj[key] = self.resolve_references(reader, obj[key])
+                obj[key] = self.resolve_references(reader, obj[key], visited)
         elif isinstance(obj, list):
             for i, value in enumerate(obj):
-                obj[i] = self.resolve_references(reader, value)
+                obj[i] = self.resolve_references(reader, value, visited)
         elif isinstance(obj, UArrayProperty):
-            obj.elems = self.resolve_references(reader, obj.elems)
+            obj.elems = self.resolve_references(reader, obj.elems, visited)
         elif isinstance(obj, UStructProperty):
-            obj.fields = self.resolve_references(reader, obj.fields)
-        elif isinstance(obj, UObjectProperty):
-            reader, obj = self.read_object(reader, obj.Index)
-        elif isinstance(obj, UProperty):
-            obj.Data = self.resolve_references(reader, obj.Data)
+            obj.fields = self.resolve_references(reader, obj.fields, visited)
+        else:
+            obj.Data = self.resolve_references(reader, obj.Data, visited)
 
-        self.visited.append(obj)
         return obj
 
 def inherit_properties(sub, base):
@@ -169,10 +185,9 @@ def get_component(blueprint, name):
 def read_gun(manager, path):
     reader = manager.open_package(path)
 
-    for export in reader.ExportTable:
-        if reader.GetObjectName(export.ClassIndex) == "BlueprintGeneratedClass":
-            blueprint = manager.read_export(reader, export.ObjectName)
-            break
+    for index in reader.FindExportsOfClass("BlueprintGeneratedClass"):
+        blueprint = manager.read_export(reader, reader.GetObjectName(index))
+        break
 
     magazine    = get_component(blueprint, "MagazineAmmo")
     reserve     = get_component(blueprint, "ReserveAmmo")
@@ -250,14 +265,18 @@ def json_default(obj):
 
         return json_default(obj.Data)
     elif isinstance(obj, UArrayProperty):
-        if obj.elems and obj.elems[0].StructName == "RichCurveKey":
+        if obj.StructName == "RichCurveKey":
             return [*process_curve(obj)]
         return json_default(obj.elems)
+    elif isinstance(obj, FStructArray):
+        return struct_array_rows(obj)
     elif isinstance(obj, UStructProperty):
         return json_default(obj.fields)
     elif isinstance(obj, float):
-        return next((r for r in (round(obj, n) for n in range(10))
-                             if float32(obj) == float32(r)), obj)
+        return round_float32(obj)
+    elif isinstance(obj, ndarray):
+        # Left to the output format
+        return obj
     elif isinstance(obj, dict):
         return {json_default(k): json_default(v) for k, v in obj.items()}
     elif hasattr(obj, "__dict__"):
@@ -265,38 +284,73 @@ def json_default(obj):
     else:
         return obj
 
-def dump_gun(path):
+def dump_gun(path, cache=None, format="json"):
+    """
+    Dump a gun to JSON or MessagePack, returning the files of every package
+    it was read from, including the ones its imports were resolved to, and
+    of the packages imports were resolved to that couldn't be opened.
+    """
     game_path = get_game_path(path)
-    out_path = get_output_path(path)
-    gun = read_gun(AssetManager(game_path), path)
+    out_path = get_output_path(path, format)
+    manager = AssetManager(game_path, cache)
+    gun = read_gun(manager, path)
 
-    output = json.dumps(gun, default=json_default, indent=4)
+    if format == "json":
+        output = json.dumps(gun, default=json_output_default(json_default),
+                            indent=4)
+    else:
+        output = msgpack_packer(json_default).pack(gun)
 
     try:
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        with open(out_path, "w") as file:
+        with open(out_path, "w" if format == "json" else "wb") as file:
             file.write(output)
         print(f"Wrote to \"{out_path}\"")
     except (OSError, IOError):
         print(f"Unable to open output file \"{out_path}\"", file=sys.stderr)
-
-def main():
-    logging.basicConfig(format="%(levelname)s: %(message)s",
-                        level=logging.INFO)
-
-    if len(sys.argv) < 2:
-        print("Usage: gun_dump.py <uasset 1> <uasset 2> ...", file=sys.stderr)
         return
 
-    for path in sys.argv[1:]:
-        if path.endswith(".uexp"):
-            continue
+    return [*(file for package in manager.package_cache
+                  for file in package_files(package)),
+            *manager.missing_packages]
 
-        try:
-            dump_gun(path)
-        except:
-            print(f"Exception while processing {os.path.basename(path)}:")
-            traceback.print_exc()
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dump gun stats to JSON or MessagePack.")
+    parser.add_argument("paths", nargs="+", metavar="uasset")
+    parser.add_argument("-j", "--jobs", type=job_count, default=1,
+                        help="number of packages to dump in parallel, "
+                             "0 for one per core")
+    parser.add_argument("-t", "--trace", action="store_true",
+                        help="log every property with its package offset")
+    parser.add_argument("-c", "--cache", metavar="DIR",
+                        help="directory to cache parsed packages in, "
+                             "which reads every export of a package up "
+                             "front instead of as it is dumped")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="only dump guns whose packages or the packages "
+                             "they import changed since the last "
+                             "incremental run")
+    parser.add_argument("-f", "--format", choices=OUTPUT_EXTENSIONS,
+                        default="json", help="output format "
+                                             "(default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.format == "msgpack" and msgpack is None:
+        parser.error("msgpack is needed for --format msgpack")
+
+    logging.basicConfig(format="%(levelname)s: %(message)s",
+                        level=logging.DEBUG if args.trace else logging.INFO)
+
+    paths = [path for path in args.paths if not path.endswith(".uexp")]
+    cache = PackageCache(args.cache) if args.cache else None
+    dump = functools.partial(dump_gun, cache=cache, format=args.format)
+    if args.incremental:
+        log = DependencyLog(DEPENDENCY_LOG_PATH, [__file__, *source_files()])
+        output_path = functools.partial(get_output_path, format=args.format)
+        run_incremental_jobs(dump, paths, output_path, log, args.jobs)
+    else:
+        run_jobs(dump, paths, args.jobs)
 
 if __name__ == "__main__":
     main()
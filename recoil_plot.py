@@ -1,12 +1,14 @@
-import json
+import argparse
 import math
 import numpy as np
 import os
-import sys
 import matplotlib.pyplot as plt
-from itertools import pairwise
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Polygon
 from matplotlib.transforms import Bbox
-from numpy import array, float32, linalg
+from numpy import array, float32
+from ue4.jobs import job_count, run_jobs
+from ue4.output import load_output
 
 VIEWPORT_X = 1920
 VIEWPORT_Y = 1080
@@ -19,6 +21,8 @@ ZOOM       = 1
 
 SHOW_ERROR = False
 
+BACKGROUND_PATH = "recoil_bg.png"
+
 HALF_VFOV_TAN = math.tan(103 / 2 * math.pi/180) * 9/16
 
 ONE_THIRD = float32(1) / float32(3)
@@ -43,44 +47,168 @@ def lerp(a, b, t):
 def bezier(a, *b, t):
     return bezier(*(lerp(*p, t) for p in zip([a, *b], b)), t=t) if b else a
 
+class RichCurve():
+    """
+    Curve keys compiled for evaluating many times at once. Segments are found
+    with a binary search and evaluated with the same float32 operations as
+    eval_curve used per time, so results match it exactly.
+    """
+    def __init__(self, keys):
+        if len(keys) == 1:
+            # Single key curves are written without times
+            self.Times  = array([0], float32)
+            self.Values = array([keys[0].Value], float32)
+        else:
+            self.Times  = array([key.Time  for key in keys], float32)
+            self.Values = array([key.Value for key in keys], float32)
+
+        # Per segment, from its first key
+        self.Modes  = array([key.InterpMode for key in keys[:-1]], object)
+        self.Deltas = self.Times[1:] - self.Times[:-1]
+
+        # Inner control points of the cubic segments' bezier curves
+        leave  = array([key.get('LeaveTangent',  0) for key in keys[:-1]],
+                       float32)
+        arrive = array([key.get('ArriveTangent', 0) for key in keys[1:]],
+                       float32)
+        self.Control1 = self.Values[:-1] + (leave  * self.Deltas * ONE_THIRD)
+        self.Control2 = self.Values[1:]  - (arrive * self.Deltas * ONE_THIRD)
+
+        # Values every 1/subdivs bullets from bullet 0, by subdivs
+        self.Samples = {}
+
+    def __call__(self, times):
+        """Evaluate the curve at a time or an array of times."""
+        times = np.asarray(times, float32)
+        if len(self.Times) == 1:
+            return np.full_like(times, self.Values[0])[()]
+
+        # First key after each time, like scanning for it
+        i = np.searchsorted(self.Times, times, side='right') - 1
+        i = np.clip(i, 0, len(self.Deltas) - 1)
+        p0, p3 = self.Values[i], self.Values[i + 1]
+        p1, p2 = self.Control1[i], self.Control2[i]
+        modes  = self.Modes[i]
+
+        with np.errstate(all='ignore'):
+            alpha = (times - self.Times[i]) / self.Deltas[i]
+            cubic = bezier(p0, p1, p2, p3, t=alpha)
+            result = np.select([modes == 'RCIM_Constant',
+                                modes == 'RCIM_Linear',
+                                modes == 'RCIM_Cubic'],
+                               [p0, lerp(p0, p3, alpha), cubic],
+                               float32(np.nan))
+
+        result = np.where(times >= self.Times[-1], self.Values[-1], result)
+        result = np.where(times <= self.Times[0],  self.Values[0],  result)
+        return result.astype(float32)[()]
+
+    def sample(self, first, last, subdivs):
+        """
+        Evaluate the curve at bullets n / subdivs for n from first to last.
+        Values from bullet 0 are kept per subdivs, so that patterns over the
+        same curve share them. The result is read only.
+        """
+        if first < 0:
+            return self(np.arange(first, last + 1) / subdivs)
+
+        values = self.Samples.get(subdivs)
+        if values is None or len(values) <= last:
+            values = self(np.arange(last + 1) / subdivs)
+            values.flags.writeable = False
+            self.Samples[subdivs] = values
+        return values[first:last + 1]
+
+    def coefficients(self):
+        """
+        Power basis coefficients (c0, c1, c2, c3) of each segment in terms of
+        its alpha, in float64. Constant segments only have c0.
+        """
+        p0, p1 = self.Values[:-1].astype(float), self.Control1.astype(float)
+        p2, p3 = self.Control2.astype(float), self.Values[1:].astype(float)
+        zero     = np.zeros_like(p0)
+        constant = (p0, zero, zero, zero)
+        linear   = (p0, p3 - p0, zero, zero)
+        cubic    = (p0, 3 * (p1 - p0), 3 * (p0 - 2*p1 + p2),
+                    p3 - p0 + 3 * (p1 - p2))
+        return [np.select([self.Modes == 'RCIM_Linear',
+                           self.Modes == 'RCIM_Cubic'], [l, c], k)
+                for k, l, c in zip(constant, linear, cubic)]
+
+    def solve(self, value, first=False):
+        """
+        Times where the curve reaches a value, solving the linear or cubic
+        equation of each segment. Returns every root in order, including
+        every root of non-monotonic segments and the start of flat segments
+        at the value, or only the first (None if the curve never reaches it).
+        """
+        roots = []
+        if len(self.Times) == 1:
+            roots = [self.Times[0]] if self.Values[0] == value else []
+        for i, (c0, c1, c2, c3) in enumerate(zip(*self.coefficients())):
+            if c1 == c2 == c3 == 0:
+                alphas = [0] if c0 == value else []
+            else:
+                alphas = [a.real for a in np.roots([c3, c2, c1, c0 - value])
+                          if abs(a.imag) < 1e-9 and 0 <= a.real < 1]
+            roots += [self.Times[i] + a * self.Deltas[i]
+                      for a in sorted(alphas)]
+        if len(self.Times) > 1 and self.Values[-1] == value:
+            roots.append(self.Times[-1])
+
+        roots = sorted(set(float(root) for root in roots))
+        if first:
+            return roots[0] if roots else None
+        return roots
+
+    def turning_points(self):
+        """Times of the local extrema inside cubic segments."""
+        points = []
+        for i, (c0, c1, c2, c3) in enumerate(zip(*self.coefficients())):
+            if c2 != 0 or c3 != 0:
+                points += [float(self.Times[i] + a.real * self.Deltas[i])
+                           for a in np.roots([3 * c3, 2 * c2, c1])
+                           if abs(a.imag) < 1e-9 and 0 < a.real < 1]
+        return points
+
+# Compiled curves by the id of their keys, which are kept alive with them
+def compile_curve(curve):
+    if isinstance(curve, RichCurve):
+        return curve
+    return RichCurve(curve)
+
+def firing_curve(owner):
+    """
+    Compile owner.FiringCurve once, keeping it on owner so that it's freed
+    along with the gun.
+    """
+    if (curve := vars(owner).get("CompiledFiringCurve")) is None:
+        curve = owner.CompiledFiringCurve = RichCurve(owner.FiringCurve)
+    return curve
+
 def eval_curve(curve, time):
-    time = float32(time)
-
-    if time <= curve[0].Time:
-        return curve[0].Value
-    if time >= curve[-1].Time:
-        return curve[-1].Value
-
-    key1, key2 = next(filter(lambda pair: pair[1].Time > time, pairwise(curve)))
-    delta = key2.Time - key1.Time
-    alpha = (time - key1.Time) / delta
-
-    match key1.InterpMode:
-        case 'RCIM_Constant':
-            return key1.Value
-        case 'RCIM_Linear':
-            return lerp(key1.Value, key2.Value, alpha)
-        case 'RCIM_Cubic':
-            return bezier(key1.Value,
-                          key1.Value + (key1.LeaveTangent  * delta * ONE_THIRD),
-                          key2.Value - (key2.ArriveTangent * delta * ONE_THIRD),
-                          key2.Value,
-                          t=alpha)
+    return compile_curve(curve)(time)
 
 def smooth_step(a, b, t):
     return lerp(a, b, (3 - 2*t) * t*t)
 
+def tan_deg(degrees):
+    radians = degrees * math.pi/180
+    if isinstance(radians, np.ndarray):
+        # math.tan per value, since np.tan can differ from it in the last bit
+        return array([math.tan(x) for x in radians.tolist()])
+    return math.tan(radians)
+
 def deg_to_mil(degrees):
-    return math.tan(degrees * math.pi/180) * 1000
+    return tan_deg(degrees) * 1000
 
 def deg_to_px(degrees):
-    return math.tan(degrees * math.pi/180) / HALF_VFOV_TAN * VIEWPORT_Y/2
+    return tan_deg(degrees) / HALF_VFOV_TAN * VIEWPORT_Y/2
 
 def get_pattern(gun, start=None, end=None, *, flip=False, subdivs=1,
                 units='px', half=True, invert=True):
     stability       = gun.Stability
     yaw_manipulator = stability.YawDirectionManipulator
-    flip_time       = 0.0
 
     if start is None:
         start = int(yaw_manipulator.ProtectedBulletCount + 1) if flip else 0
@@ -88,106 +216,430 @@ def get_pattern(gun, start=None, end=None, *, flip=False, subdivs=1,
     if end is None:
         end = int(gun.MagazineAmmo.MaxAmmo)
 
-    pattern = []
-
-    for n in range(start * subdivs, (end - 1) * subdivs + 1):
-        bullet = n / subdivs
-        pitch  = eval_curve(stability.PitchRecoil.FiringCurve, bullet)
-        yaw    = eval_curve(stability.YawRecoil.FiringCurve,   bullet)
-
-        if flip and bullet >= yaw_manipulator.ProtectedBulletCount + 1:
-            fraction = flip_time / yaw_manipulator.TimeToSwitchYaw
-            yaw *= smooth_step(1, -1, min(fraction, 1))
-            flip_time += 1 / gun.FiringState.FiringRate / subdivs
-
-        if invert: pitch, yaw = -pitch,   -yaw
-        if half:   pitch, yaw =  pitch/2,  yaw/2
-
-        match units:
-            case 'deg': pattern.append((pitch, yaw))
-            case 'mil': pattern.append((deg_to_mil(yaw), deg_to_mil(pitch)))
-            case 'px':  pattern.append((deg_to_px (yaw), deg_to_px (pitch)))
-            case _:     raise ValueError
-
-    return array(pattern)
+    first, last = start * subdivs, (end - 1) * subdivs
+    bullets = np.arange(first, last + 1) / subdivs
+    pitch = firing_curve(stability.PitchRecoil).sample(first, last, subdivs)
+    yaw   = firing_curve(stability.YawRecoil  ).sample(first, last, subdivs)
+
+    if flip:
+        # Time since the yaw started switching, before each flipped bullet,
+        # summed in the same order and precision as one bullet at a time
+        flipped   = bullets >= yaw_manipulator.ProtectedBulletCount + 1
+        step      = 1 / gun.FiringState.FiringRate / subdivs
+        steps     = np.full(np.count_nonzero(flipped), step)
+        steps[:1] = 0
+        flip_time = np.cumsum(steps)
+
+        # Divided and smoothed in the precision the scalars had, and rounded
+        # to float32 before scaling like a Python float factor would be
+        time_to_switch = yaw_manipulator.TimeToSwitchYaw
+        fraction = (flip_time.astype(np.result_type(step, time_to_switch)) /
+                    time_to_switch)
+        factor = smooth_step(1, -1, np.minimum(fraction, 1))
+        yaw = yaw.copy()
+        yaw[flipped] *= factor.astype(float32)
+
+    if invert: pitch, yaw = -pitch,   -yaw
+    if half:   pitch, yaw =  pitch/2,  yaw/2
+
+    match units:
+        case 'deg': return np.column_stack((pitch, yaw))
+        case 'mil': return np.column_stack((deg_to_mil(yaw), deg_to_mil(pitch)))
+        case 'px':  return np.column_stack((deg_to_px (yaw), deg_to_px (pitch)))
+        case _:     raise ValueError
 
 def get_error(gun, start=0, end=None, *, subdivs=1, units='px'):
     if end is None:
         end = int(gun.MagazineAmmo.MaxAmmo)
 
-    curve = []
-
-    for n in range(start * subdivs, (end - 1) * subdivs + 1):
-        bullet = n / subdivs
-        error = eval_curve(gun.Stability.Error.FiringCurve, bullet)
-
-        match units:
-            case 'deg': curve.append(error)
-            case 'mil': curve.append(deg_to_mil(error))
-            case 'px':  curve.append(deg_to_px (error))
-            case _:     raise ValueError
-
-    return array(curve)
-
-def line_intersection(a, b):
-    try:
-        return linalg.solve(array([a[1]-a[0], b[0]-b[1]]).T, b[0]-a[0])
-    except linalg.LinAlgError:
-        return None
+    error = firing_curve(gun.Stability.Error).sample(
+        start * subdivs, (end - 1) * subdivs, subdivs)
+
+    match units:
+        case 'deg': return error.copy()
+        case 'mil': return deg_to_mil(error)
+        case 'px':  return deg_to_px (error)
+        case _:     raise ValueError
+
+# Segments spanning more grid cells than this along x or y are checked
+# against every bounding box instead of hashed into all of those cells
+LONG_SEGMENT_CELLS = 8
+
+def segment_pairs(points):
+    """
+    Pairs (i, j) of segments of a polyline, with j > i + 1, that share a
+    cell of a uniform grid, which every pair that intersects does, or whose
+    bounding boxes overlap for long segments.
+    """
+    start, end = points[:-1], points[1:]
+    low, high = np.minimum(start, end), np.maximum(start, end)
+
+    # Points that don't move can't cross anything, but would crowd a cell
+    moving = np.flatnonzero((high > low).any(axis=1))
+    low, high = low[moving], high[moving]
+    if len(moving) < 2:
+        return moving[:0], moving[:0]
+
+    # Cells about as large as the segments, so each only spans a few
+    extent = (high - low).max(axis=1)
+    size = extent.mean()
+    long = extent > LONG_SEGMENT_CELLS * size
+
+    # Long segments against every segment whose bounding box overlaps theirs
+    long_i, long_j = [], []
+    for k in np.flatnonzero(long):
+        overlap = np.flatnonzero((low <= high[k]).all(axis=1) &
+                                 (high >= low[k]).all(axis=1))
+        long_i.append(np.full(len(overlap), moving[k]))
+        long_j.append(moving[overlap])
+
+    moving, low, high = moving[~long], low[~long], high[~long]
+    first = np.floor((low  - low.min(axis=0)) / size).astype(int)
+    last  = np.floor((high - low.min(axis=0)) / size).astype(int)
+
+    # Every (cell, segment) the segments' bounding boxes cover
+    spans = last - first + 1
+    counts = spans[:,0] * spans[:,1]
+    box = np.repeat(np.arange(len(moving)), counts)
+    index = np.arange(len(box)) - np.repeat(np.cumsum(counts) - counts, counts)
+    segment = moving[box]
+    cell_x = first[box,0] + index % spans[box,0]
+    cell_y = first[box,1] + index // spans[box,0]
+    cell = cell_x * (last[:,1].max() + 1) + cell_y
+
+    order = np.lexsort((segment, cell))
+    cell, segment = cell[order], segment[order]
+
+    # Each entry against the ones after it in the same cell
+    group_end = np.searchsorted(cell, cell, side='right')
+    counts = group_end - np.arange(len(cell)) - 1
+    a = np.repeat(np.arange(len(cell)), counts)
+    b = a + 1 + np.arange(len(a)) - np.repeat(np.cumsum(counts) - counts,
+                                              counts)
+    i = np.concatenate([segment[a], *long_i])
+    j = np.concatenate([segment[b], *long_j])
+    i, j = np.minimum(i, j), np.maximum(i, j)
+
+    pairs = np.unique(i * len(start) + j)
+    i, j = pairs // len(start), pairs % len(start)
+    keep = j > i + 1
+    return i[keep], j[keep]
+
+def segment_intersections(points, i, j):
+    """
+    Where segments i and j of a polyline intersect, as the fractions t and u
+    along each, for the pairs that do.
+    """
+    p, r = points[i], points[i+1] - points[i]
+    q, s = points[j], points[j+1] - points[j]
+    cross = r[:,0]*s[:,1] - r[:,1]*s[:,0]
+    qp = q - p
+
+    # Parallel segments are left out, as their overlaps have no one point
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (qp[:,0]*s[:,1] - qp[:,1]*s[:,0]) / cross
+        u = (qp[:,0]*r[:,1] - qp[:,1]*r[:,0]) / cross
+    hit = (cross != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+    return i[hit], j[hit], t[hit], u[hit]
 
 def fix_overlap(points):
-    i = 0
-    result = []
-    while i < len(points) - 1:
-        low_t = 1
-        closest = None
-        for j in range(len(points) - 1):
-            if (t := line_intersection(points[i:i+2], points[j:j+2])):
-                t[0]
-
-def dump_plot(gun, out_path):
-    plt.figure(figsize=RESOLUTION / DPI, dpi=DPI)
-    plt.axes([0, 0, 1, 1], frameon=False)
-
-    plt.imshow(plt.imread("recoil_bg.png"), extent=VIEWPORT)
-    plt.axhspan(*VIEWPORT[2:4], *VIEWPORT[0:2], color='0', alpha=0.75)
-
-    spray = get_pattern(gun, 0, subdivs=10, flip=False)
-    flip  = get_pattern(gun, 0, subdivs=10, flip=True )
-    spray = array([*spray, spray[spray[:,1].argsort()[0]]]).T
-    flip  = array([*flip,  flip [flip [:,1].argsort()[0]]]).T
-    plt.fill_betweenx(spray[1], spray[0], flip[0], fc='1', alpha=0.25)
-
-    plt.plot(*get_pattern(gun, subdivs=10, flip=True ).T, c='#13AFC07F')
-    plt.plot(*get_pattern(gun, subdivs=10, flip=False).T, c='#FF7F007F')
-
-    plt.plot(*get_pattern(gun, flip=True ).T, "o", c='#13AFC0')
-    plt.plot(*get_pattern(gun, flip=False).T, "o", c='#FF7F00')
+    """
+    Removes the loops of a polyline. Walking from its start, whenever the
+    line crosses a later part of itself, it skips ahead to there.
+    """
+    points = np.asarray(points, float)
+    if len(points) < 4:
+        return points
+
+    i, j, t, u = segment_intersections(points, *segment_pairs(points))
+
+    # Crossings in the order they are walked past, as segment * 2 + t
+    order = np.lexsort((t, i))
+    i, j, t, u = i[order], j[order], t[order], u[order]
+    keys = i * 2 + t
+
+    result = [points[:1]]
+    segment, fraction = 0, 0.0
+    while (k := np.searchsorted(keys, segment * 2 + fraction,
+                                side='right')) < len(keys):
+        result.append(points[segment + 1 : i[k] + 1])
+        result.append(points[i[k]] + t[k] * (points[i[k] + 1] - points[i[k]]))
+        segment, fraction = j[k], u[k]
+
+    result.append(points[segment + 1:])
+    return np.vstack(result)
+
+# Formats and colors of the lines and dots drawn over the filled region, in
+# drawing order, and of the error ones drawn with SHOW_ERROR
+PLOT_STYLES  = [("-", '#13AFC07F'), ("-", '#FF7F007F'),
+                ("o", '#13AFC0'),   ("o", '#FF7F00')]
+ERROR_STYLES = [("-", '#FF00FF7F'), ("o", '#FF00FF')]
+
+# Rows sampled per pixel when filling polygons in RasterRenderer
+FILL_SUBSAMPLES = 4
+
+def get_plot_data(gun):
+    """
+    Data of a plot: the outline of the region between the spray and flip
+    patterns as (x, y), and the (x, y) of each of PLOT_STYLES (and
+    ERROR_STYLES).
+    """
+    # Without their loops, which would be filled as well otherwise
+    spray = fix_overlap(get_pattern(gun, 0, subdivs=10, flip=False))
+    flip  = fix_overlap(get_pattern(gun, 0, subdivs=10, flip=True ))
+    spray = array([*spray, spray[spray[:,1].argsort()[0]]])
+    flip  = array([*flip,  flip [flip [:,1].argsort()[0]]])
+    fill  = np.concatenate([spray, flip[::-1]]).T
+
+    lines = [get_pattern(gun, subdivs=10, flip=True ).T,
+             get_pattern(gun, subdivs=10, flip=False).T,
+             get_pattern(gun, flip=True ).T,
+             get_pattern(gun, flip=False).T]
 
     if SHOW_ERROR:
         error_end = int(gun.Stability.Error.FiringCurve[-1].Time) + 1
         error = get_error(gun, 0, error_end)
-        plt.plot(error, np.zeros(error_end),      c='#FF00FF7F')
-        plt.plot(error, np.zeros(error_end), "o", c='#FF00FF')
-
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    plt.savefig(out_path, dpi=DPI*ZOOM, bbox_inches=BBOX)
-    print(f"Wrote to \"{out_path}\"")
-
-def main():
-    class JsonHook(dict):
-        def __getattr__(self, name):
-            match self[name]:
-                case float(f): return float32(f)
-                case value:    return value
-
+        lines += [(error, np.zeros(error_end))] * 2
+
+    return fill, lines
+
+class PlotRenderer():
+    """
+    One figure that every plot is drawn in. The background is only drawn
+    once, and each gun's patterns replace the data of the last one's
+    artists.
+    """
+    def __init__(self, background):
+        self.figure = plt.figure(figsize=RESOLUTION / DPI, dpi=DPI)
+        self.axes = self.figure.add_axes([0, 0, 1, 1], frameon=False)
+
+        self.axes.imshow(background, extent=VIEWPORT)
+        self.axes.axhspan(*VIEWPORT[2:4], *VIEWPORT[0:2], color='0', alpha=0.75)
+
+        self.fill = self.axes.add_patch(
+            Polygon(np.zeros((0, 2)), fc='1', ec='none', alpha=0.25))
+
+        styles = PLOT_STYLES + (ERROR_STYLES if SHOW_ERROR else [])
+        self.lines = [self.axes.plot([], [], fmt, c=color)[0]
+                      for fmt, color in styles]
+
+    def render(self, gun, out_path):
+        fill, lines = get_plot_data(gun)
+        self.fill.set_xy(np.column_stack(fill))
+        for artist, data in zip(self.lines, lines):
+            artist.set_data(*data)
+
+        # Limits as a new figure with only this gun's artists would have
+        self.axes.relim()
+        self.axes.autoscale_view()
+
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        self.figure.savefig(out_path, dpi=DPI*ZOOM, bbox_inches=BBOX)
+        print(f"Wrote to \"{out_path}\"")
+
+class RasterRenderer():
+    """
+    Draws plots straight into an array of the cropped output with NumPy,
+    without matplotlib figures. Shapes are antialiased by their coverage of
+    each pixel, so the result matches PlotRenderer up to antialiasing, as
+    long as the patterns stay inside the viewport (where matplotlib would
+    zoom out instead).
+    """
+    def __init__(self, background):
+        self.width, self.height = CROP * ZOOM
+
+        # Figure pixels to the cropped output's, which has ZOOM pixels per
+        # figure pixel and its origin at the top left
+        unit = (VIEWPORT[1] - VIEWPORT[0]) / RESOLUTION[0]
+        self.left = VIEWPORT[0] + (RESOLUTION[0] - CROP[0]) / 2 * unit
+        self.top  = VIEWPORT[3] - (RESOLUTION[1] - CROP[1]) / 2 * unit
+        self.scale = ZOOM / unit
+
+        # Cropped once, with the dark overlay already applied
+        rows = ((RESOLUTION[1] - CROP[1]) / 2 +
+                (np.arange(self.height) + 0.5) / ZOOM) / RESOLUTION[1]
+        cols = ((RESOLUTION[0] - CROP[0]) / 2 +
+                (np.arange(self.width)  + 0.5) / ZOOM) / RESOLUTION[0]
+        rows = (rows * background.shape[0]).astype(int)
+        cols = (cols * background.shape[1]).astype(int)
+        self.background = background[rows][:, cols, :3] * float32(0.25)
+
+        pixels_per_point = DPI * ZOOM / 72
+        self.line_width = plt.rcParams['lines.linewidth'] * pixels_per_point
+        self.dot_size = plt.rcParams['lines.markersize'] * pixels_per_point
+
+        self.styles = PLOT_STYLES + (ERROR_STYLES if SHOW_ERROR else [])
+
+    def to_pixels(self, x, y):
+        return ((np.asarray(x, float) - self.left) * self.scale,
+                (self.top - np.asarray(y, float)) * self.scale)
+
+    def fill_coverage(self, x, y):
+        """
+        Coverage of each pixel by a polygon, with the nonzero winding rule.
+        Each pixel samples FILL_SUBSAMPLES rows, and the coverage along a
+        row is exact.
+        """
+        S = FILL_SUBSAMPLES
+        x0, y0 = self.to_pixels(x, y)
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+        # Sample rows crossed by each edge, half open at the top
+        rows  = self.height * S
+        first = np.clip(np.ceil(np.minimum(y0, y1) * S - 0.5), 0, rows)
+        end   = np.clip(np.ceil(np.maximum(y0, y1) * S - 0.5), 0, rows)
+        counts = (end - first).astype(int)
+        edge = np.repeat(np.arange(len(x0)), counts)
+        row = (first[edge] + np.arange(len(edge)) -
+               np.repeat(np.cumsum(counts) - counts, counts)).astype(int)
+
+        sample_y = (row + 0.5) / S
+        crossing = x0[edge] + ((sample_y - y0[edge]) *
+                               (x1[edge] - x0[edge]) / (y1[edge] - y0[edge]))
+        direction = np.sign(y1 - y0)[edge]
+
+        # Spans between crossings where the winding isn't 0, which every
+        # row ends back at
+        order = np.lexsort((crossing, row))
+        crossing, row = crossing[order], row[order]
+        winding = np.cumsum(direction[order])
+        span = (winding[:-1] != 0) & (row[:-1] == row[1:])
+        start = np.clip(crossing[:-1][span], 0, self.width)
+        stop  = np.clip(crossing[1:][span],  0, self.width)
+        pixel_row = row[:-1][span] // S
+
+        # Each span covers clip(stop - c, 0, 1) - clip(start - c, 0, 1) of
+        # column c, summed as steps and partial pixels
+        steps   = np.zeros((self.height, self.width + 1))
+        partial = np.zeros((self.height, self.width + 1))
+        for edges, sign in [(stop, 1), (start, -1)]:
+            column = np.floor(edges).astype(int)
+            np.add.at(steps,   (pixel_row, 0), sign)
+            np.add.at(steps,   (pixel_row, column), -sign)
+            np.add.at(partial, (pixel_row, column), sign * (edges - column))
+
+        coverage = np.cumsum(steps, axis=1) + partial
+        return np.clip(coverage[:, :self.width] / S, 0, 1)
+
+    def stroke_coverage(self, x, y, width, dots=False):
+        """
+        Coverage of each pixel by a polyline of a width in pixels, or by
+        dots of that diameter, from the distance of its center to them.
+        """
+        ax, ay = self.to_pixels(x, y)
+        if dots:
+            bx, by = ax, ay
+        else:
+            ax, ay, bx, by = ax[:-1], ay[:-1], ax[1:], ay[1:]
+        radius = width / 2
+
+        # Pixels around each segment
+        left   = np.clip(np.floor(np.minimum(ax, bx) - radius) - 1,
+                         0, self.width)
+        right  = np.clip(np.ceil (np.maximum(ax, bx) + radius) + 1,
+                         0, self.width)
+        top    = np.clip(np.floor(np.minimum(ay, by) - radius) - 1,
+                         0, self.height)
+        bottom = np.clip(np.ceil (np.maximum(ay, by) + radius) + 1,
+                         0, self.height)
+        cols, rows = (right - left).astype(int), (bottom - top).astype(int)
+        counts = cols * rows
+        segment = np.repeat(np.arange(len(ax)), counts)
+        index = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts,
+                                                    counts)
+        col = (left[segment] + index % cols[segment]).astype(int)
+        row = (top[segment]  + index // cols[segment]).astype(int)
+
+        # Distance from each pixel center to the closest point of the segment
+        dx, dy = bx[segment] - ax[segment], by[segment] - ay[segment]
+        px, py = col + 0.5 - ax[segment], row + 0.5 - ay[segment]
+        length = dx*dx + dy*dy
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.where(length > 0, (px*dx + py*dy) / length, 0)
+        t = np.clip(t, 0, 1)
+        distance = np.hypot(px - t*dx, py - t*dy)
+
+        coverage = np.zeros(self.height * self.width)
+        np.maximum.at(coverage, row * self.width + col,
+                      np.clip(radius + 0.5 - distance, 0, 1))
+        return coverage.reshape(self.height, self.width)
+
+    @staticmethod
+    def blend(image, coverage, color):
+        # Only over the rows and columns that are covered at all
+        rows = np.flatnonzero(coverage.any(axis=1))
+        cols = np.flatnonzero(coverage.any(axis=0))
+        if len(rows) == 0:
+            return
+        area = np.s_[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+        r, g, b, a = to_rgba(color)
+        alpha = (coverage[area] * a)[..., None]
+        image[area] *= 1 - alpha
+        image[area] += alpha * array([r, g, b])
+
+    def render(self, gun, out_path):
+        image = self.background.astype(float)
+        fill, lines = get_plot_data(gun)
+
+        self.blend(image, self.fill_coverage(*fill), (1, 1, 1, 0.25))
+
+        for (fmt, color), (x, y) in zip(self.styles, lines):
+            if fmt == "o":
+                coverage = self.stroke_coverage(x, y, self.dot_size, dots=True)
+            else:
+                coverage = self.stroke_coverage(x, y, self.line_width)
+            self.blend(image, coverage, color)
+
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        # As 8 bit RGBA, which is saved as is, with faster compression
+        pixels = np.empty((self.height, self.width, 4), np.uint8)
+        pixels[..., :3] = np.clip(image * 255 + 0.5, 0, 255)
+        pixels[..., 3] = 255
+        plt.imsave(out_path, pixels, pil_kwargs={"compress_level": 1})
+        print(f"Wrote to \"{out_path}\"")
+
+# The renderer of this process, made by init_renderer()
+RENDERER = None
+
+def init_renderer(background, raster=False):
+    global RENDERER
     plt.rc('lines', linewidth=0.5/ZOOM, markersize=1/ZOOM, markeredgewidth=0)
+    RENDERER = (RasterRenderer if raster else PlotRenderer)(background)
 
-    for path in sys.argv[1:]:
-        with open(path, "r") as file:
-            gun = json.load(file, object_hook=JsonHook)
+def dump_plot(gun, out_path):
+    if RENDERER is None:
+        init_renderer(plt.imread(BACKGROUND_PATH))
+    RENDERER.render(gun, out_path)
+
+def plot_file(path):
+    """Plot a gun output of gun_dump."""
+    with open(path, "rb") as file:
+        gun = load_output(file, object_hook=JsonHook)
+    dump_plot(gun, get_output_path(path))
+
+class JsonHook(dict):
+    def __getattr__(self, name):
+        match self[name]:
+            case float(f): return float32(f)
+            case value:    return value
 
-        dump_plot(gun, get_output_path(path))
+def main():
+    parser = argparse.ArgumentParser(description="Plot recoil patterns.")
+    parser.add_argument("paths", nargs="+", metavar="json",
+                        help="gun_dump output")
+    parser.add_argument("-j", "--jobs", type=job_count, default=1,
+                        help="number of plots to render in parallel, "
+                             "0 for one per core")
+    parser.add_argument("-r", "--raster", action="store_true",
+                        help="draw with NumPy instead of matplotlib figures, "
+                             "which is faster but only antialiased alike")
+    args = parser.parse_args()
+
+    # Decoded once and handed to every worker
+    background = plt.imread(BACKGROUND_PATH)
+    run_jobs(plot_file, args.paths, args.jobs, init_renderer,
+             (background, args.raster))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from recoil_plot import fix_overlap, segment_intersections, segment_pairs
+
+# Checks the grid hashed segment intersections against testing every pair of
+# segments, over random polylines shaped like recoil patterns and worse.
+
+POLYLINE_COUNT = 300
+
+def random_polyline(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(2, 120))
+    scale = rng.choice([0.01, 1, 10])
+    points = np.cumsum(rng.normal(size=(count, 2)) * scale, axis=0)
+
+    match seed % 4:
+        case 1:
+            # Plateau, like the end of a curve
+            points[count // 2:] = points[count // 2]
+        case 2:
+            # One long jump among small steps
+            points[count // 2:] += rng.normal(size=2) * scale * 100
+        case 3:
+            # Straight up and down
+            points[:, 0] = np.round(points[:, 0] / scale)
+    return points
+
+def reference_intersections(points):
+    """Every pair of non-adjacent segments that intersect, one at a time."""
+    result = set()
+    for i in range(len(points) - 1):
+        for j in range(i + 2, len(points) - 1):
+            (px, py), (qx, qy) = points[i], points[j]
+            rx, ry = points[i + 1] - points[i]
+            sx, sy = points[j + 1] - points[j]
+            cross = rx * sy - ry * sx
+            if cross == 0:
+                continue
+            t = ((qx - px) * sy - (qy - py) * sx) / cross
+            u = ((qx - px) * ry - (qy - py) * rx) / cross
+            if 0 <= t <= 1 and 0 <= u <= 1:
+                result.add((i, j))
+    return result
+
+def intersections(points):
+    i, j, _, _ = segment_intersections(points, *segment_pairs(points))
+    return set(zip(i.tolist(), j.tolist()))
+
+def test_segment_pairs():
+    for seed in range(POLYLINE_COUNT):
+        points = random_polyline(seed)
+        assert intersections(points) == reference_intersections(points), seed
+
+def test_fix_overlap():
+    # A loop between (1, 0) and (1, 2), crossing itself at (1, 1)
+    points = np.array([[0, 0], [2, 2], [2, 1], [0, 1], [0, 3]], float)
+    assert fix_overlap(points).tolist() == [[0, 0], [1, 1], [0, 1], [0, 3]]
+
+    for seed in range(POLYLINE_COUNT):
+        points = random_polyline(seed)
+        result = fix_overlap(points)
+        assert (result[0] == points[0]).all(), seed
+        assert (result[-1] == points[-1]).all(), seed
+
+        # Grid aligned ones can still touch themselves at their points
+        if seed % 4 != 3:
+            assert not reference_intersections(result), seed
@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ue4.output import ROUND_CACHE, round_float32, round_float32_array
+from ue4.output import struct_array_rows
+from ue4.structs import FStructArray, FRichCurveKey, FVector
+from ue4.structs.richcurvekey import RICH_CURVE_KEY_DTYPE
+from ue4.structs.vector import VECTOR_DTYPES
+
+# Checks that the float32 formatting shared by the exporters writes exactly
+# the same JSON as the expression json_default used before, over a corpus of
+# special values, random float32 bit patterns and decimal looking values.
+
+RANDOM_COUNT = 50000
+
+def legacy_round(obj):
+    """json_default's float branch as it was."""
+    with np.errstate(over="ignore"):
+        return next((r for r in (round(obj, n) for n in range(10))
+                            if np.float32(obj) == np.float32(r)), obj)
+
+def corpus():
+    flt_max = float(np.finfo(np.float32).max)
+    values = [0.0, -0.0, 1.0, -1.0, 0.5, 0.1, 1 / 3, float("inf"),
+              float("-inf"), float("nan"), flt_max, -flt_max,
+              flt_max * (1 + 2 ** -25), flt_max * 1.5, 1e39, 1e300, -1e300,
+              1e-45, -1e-45, 1e-50, -1e-50, 2 ** -149, 2 ** -126, 5e-324,
+              16777216.0, 16777217.0, 123456.7, 1e20, 0.000123456789]
+
+    # Every float32 bit pattern class, including denormals, infinities and
+    # NaNs, as the doubles f32 reads produce
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2 ** 32, RANDOM_COUNT, dtype=np.uint64)
+    values += np.frombuffer(bits.astype(np.uint32).tobytes(),
+                            np.float32).tolist()
+
+    # Values typed into the editor, as doubles and as float32
+    decimals = [round(rng.uniform(-1000, 1000), int(n))
+                for n in rng.integers(0, 8, RANDOM_COUNT // 5)]
+    values += decimals
+    values += np.array(decimals, dtype=np.float32).tolist()
+
+    # Doubles that aren't exact float32 values, as LWC vectors hold
+    values += rng.normal(0, 1e4, RANDOM_COUNT // 5).tolist()
+    return values
+
+def check_equal(expected, actual):
+    expected = json.dumps(expected)
+    actual = json.dumps(actual)
+    assert expected == actual, f"{expected} != {actual}"
+
+def test_round_float32():
+    values = corpus()
+    expected = [legacy_round(value) for value in values]
+
+    # Computed, then from the cache
+    ROUND_CACHE.clear()
+    check_equal(expected, [round_float32(value) for value in values])
+    check_equal(expected, [round_float32(value) for value in values])
+
+def test_round_float32_array():
+    values = corpus()
+    for dtype in ["<f4", "<f8"]:
+        with np.errstate(over="ignore"):
+            array = np.array(values, dtype=dtype)
+        for size in [0, 1, 10, 100, len(array)]:
+            expected = [legacy_round(value) for value in array[:size].tolist()]
+            ROUND_CACHE.clear()
+            check_equal(expected, round_float32_array(array[:size]))
+
+def test_struct_array_rows():
+    rng = np.random.default_rng(1)
+    for count in [0, 3, 1000]:
+        keys = np.zeros(count, RICH_CURVE_KEY_DTYPE)
+        for field in RICH_CURVE_KEY_DTYPE.names:
+            if RICH_CURVE_KEY_DTYPE[field].kind == "f":
+                keys[field] = rng.normal(0, 100, count)
+            else:
+                keys[field] = rng.integers(0, 4, count)
+        # Repeated values as curves often have
+        keys["Value"][::2] = 0.1
+
+        array = FStructArray(FRichCurveKey, keys)
+        expected = [{name: value._name_ if hasattr(value, "_name_")
+                           else legacy_round(value)
+                     for name, value in row.items()}
+                    for row in array.tolist()]
+        check_equal(expected, struct_array_rows(array))
+
+    # Double precision (LWC) vectors
+    vectors = np.array([(0.1, -0.0, 1e300), (2 ** -149, 0.0, 1 / 3)],
+                       dtype=VECTOR_DTYPES[True])
+    array = FStructArray(FVector, vectors)
+    check_equal([{k: legacy_round(v) for k, v in row.items()}
+                 for row in array.tolist()], struct_array_rows(array))
+
+if __name__ == "__main__":
+    test_round_float32()
+    test_round_float32_array()
+    test_struct_array_rows()
+    print("ok")
\ No newline at end of file
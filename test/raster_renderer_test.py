@@ -0,0 +1,44 @@
+import os
+import sys
+import matplotlib.pyplot as plt
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from recoil_plot import RESOLUTION, ZOOM, PlotRenderer, RasterRenderer
+from recoil_pattern_test import random_gun
+
+# Checks that RasterRenderer draws the same plots as PlotRenderer up to
+# antialiasing, over random guns on a noise background.
+
+GUN_COUNT = 5
+
+# Mean difference per channel, and share of pixels differing by more than
+# PIXEL_TOLERANCE, which only the edges of lines and dots should
+MEAN_TOLERANCE  = 0.005
+PIXEL_TOLERANCE = 0.25
+EDGE_SHARE      = 0.02
+
+def background():
+    # Noise, so that the background being off by a pixel shows
+    rng = np.random.default_rng(0)
+    return rng.random((RESOLUTION[1], RESOLUTION[0], 3), np.float32)
+
+def test_raster_renderer(tmp_path):
+    plt.rc('lines', linewidth=0.5/ZOOM, markersize=1/ZOOM, markeredgewidth=0)
+    renderers = [PlotRenderer(background()), RasterRenderer(background())]
+
+    for seed in range(GUN_COUNT):
+        gun = random_gun(seed)
+        images = []
+        for i, renderer in enumerate(renderers):
+            out_path = os.path.join(tmp_path, f"{seed}_{i}.png")
+            renderer.render(gun, out_path)
+            images.append(plt.imread(out_path))
+
+        expected, actual = images
+        assert expected.shape == actual.shape
+        difference = np.abs(expected - actual)
+        assert difference.mean() < MEAN_TOLERANCE, seed
+        edges = (difference.max(axis=-1) > PIXEL_TOLERANCE).mean()
+        assert edges < EDGE_SHARE, seed
+
+    plt.close(renderers[0].figure)
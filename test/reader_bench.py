@@ -0,0 +1,165 @@
+import os
+import struct
+import sys
+import timeit
+from collections import UserString
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ue4 import FPackageReader
+from ue4.types import FObjectExport, PACKAGE_FILE_TAG, PKG_FilterEditorOnly
+from ue4.structs import FRichCurveKey, ERichCurveInterpMode
+from ue4.structs import ERichCurveTangentMode, ERichCurveTangentWeightMode
+from ue4.structs import FStructArray
+
+# Microbenchmark for fixed layout record decoding. The "before" readers decode
+# one field per struct.unpack_from call with the format string parsed on every
+# call, which is what BinaryReader did before BinaryReader.unpack existed.
+
+EXPORT_COUNT = 5000
+KEY_COUNT    = 20000
+REPEAT       = 5
+
+def build_summary(headers_size, name_offset, export_offset):
+    summary = struct.pack("<Iiiii", PACKAGE_FILE_TAG, -7, 864, 0, 0)
+    summary += struct.pack("<II", 0, headers_size)
+    summary += struct.pack("<i", 5) + b"None\0"
+    summary += struct.pack("<5I", PKG_FilterEditorOnly, 2, name_offset, 0, 0)
+    summary += struct.pack("<5I", EXPORT_COUNT, export_offset, 0, 0, 0)
+    return summary
+
+def build_package():
+    """Unversioned UE4 package with a name table and a large export table."""
+    names = b"".join(struct.pack("<i", len(name) + 1) + name.encode() + b"\0" +
+                     struct.pack("<HH", 0, 0) for name in ["None", "Export"])
+
+    exports = b"".join(struct.pack("<4iIIIQQ3I4I3I5i", 0, 0, 0, 0, 1, i, 0,
+                                   0, 0, 0, 0, 0, 1, 2, 3, 4, 0, 0, 1,
+                                   -1, 0, 0, 0, 0)
+                       for i in range(EXPORT_COUNT))
+
+    name_offset = len(build_summary(0, 0, 0))
+    export_offset = name_offset + len(names)
+    headers_size = export_offset + len(exports)
+
+    return (build_summary(headers_size, name_offset, export_offset) +
+            names + exports)
+
+class LegacyReader(FPackageReader):
+    """Per-field reads as BinaryReader did them before unpack() existed."""
+    def u8(self):
+        (result,) = struct.unpack_from("B", self.buffer, self.offset)
+        self.offset += 1
+        return result
+
+    def s32(self):
+        (result,) = struct.unpack_from("<i", self.buffer, self.offset)
+        self.offset += 4
+        return result
+
+    def u32(self):
+        (result,) = struct.unpack_from("<I", self.buffer, self.offset)
+        self.offset += 4
+        return result
+
+    def u64(self):
+        (result,) = struct.unpack_from("<Q", self.buffer, self.offset)
+        self.offset += 8
+        return result
+
+    def f32(self):
+        (result,) = struct.unpack_from("<f", self.buffer, self.offset)
+        self.offset += 4
+        return result
+
+class LegacyName(UserString):
+    def __init__(self, reader):
+        self.Index = reader.u32()
+        self.ExtraIndex = reader.u32()
+        self.data = reader.NameTable[self.Index]
+        if self.ExtraIndex != 0:
+            self.data += f"_{self.ExtraIndex - 1}"
+
+class LegacyGuid():
+    def __init__(self, reader):
+        self.A = reader.u32()
+        self.B = reader.u32()
+        self.C = reader.u32()
+        self.D = reader.u32()
+
+class LegacyExport():
+    def __init__(self, reader):
+        self.ClassIndex = reader.s32()
+        self.SuperIndex = reader.s32()
+        self.TemplateIndex = reader.s32()
+        self.PackageIndex = reader.s32()
+        self.ObjectName = LegacyName(reader)
+        self.ObjectFlags = reader.u32()
+        self.SerialSize = reader.u64()
+        self.SerialOffset = reader.u64()
+        self.bForcedExport = reader.u32()
+        self.bNotForClient = reader.u32()
+        self.bNotForServer = reader.u32()
+        self.Guid = LegacyGuid(reader)
+        self.PackageFlags = reader.u32()
+        self.bNotForEditorGame = reader.u32()
+        self.bIsAsset = reader.u32()
+        self.FirstExportDependency = reader.s32()
+        self.SerializationBeforeSerializationDependencies = reader.s32()
+        self.CreateBeforeSerializationDependencies = reader.s32()
+        self.SerializationBeforeCreateDependencies = reader.s32()
+        self.CreateBeforeCreateDependencies = reader.s32()
+
+class LegacyRichCurveKey():
+    def __init__(self, reader):
+        self.InterpMode = ERichCurveInterpMode(reader.u8())
+        self.TangentMode = ERichCurveTangentMode(reader.u8())
+        self.TangentWeightMode = ERichCurveTangentWeightMode(reader.u8())
+        self.Time = reader.f32()
+        self.Value = reader.f32()
+        self.ArriveTangent = reader.f32()
+        self.ArriveTangentWeight = reader.f32()
+        self.LeaveTangent = reader.f32()
+        self.LeaveTangentWeight = reader.f32()
+
+def bench(name, before, after):
+    before = min(timeit.repeat(before, number=1, repeat=REPEAT))
+    after  = min(timeit.repeat(after,  number=1, repeat=REPEAT))
+    print(f"{name:<24} before {before * 1000:8.2f} ms  "
+          f"after {after * 1000:8.2f} ms  ({before / after:.2f}x)")
+
+def main():
+    data = build_package()
+    keys = struct.pack("<3B6f", 2, 0, 0, 0, 1, 2, 3, 4, 5) * KEY_COUNT
+
+    def run(reader_type, record_type, buffer, offset, count):
+        reader = reader_type(data)
+        reader.uasset = reader.buffer = buffer
+        def run():
+            reader.seek(offset)
+            for _ in range(count):
+                record_type(reader)
+        return run
+
+    offset = FPackageReader(data).Summary.ExportOffset
+    bench(f"{EXPORT_COUNT} FObjectExport",
+          run(LegacyReader, LegacyExport, data, offset, EXPORT_COUNT),
+          run(FPackageReader, FObjectExport, data, offset, EXPORT_COUNT))
+
+    bench(f"{KEY_COUNT} FRichCurveKey",
+          run(LegacyReader, LegacyRichCurveKey, keys, 0, KEY_COUNT),
+          run(FPackageReader, FRichCurveKey, keys, 0, KEY_COUNT))
+
+    def struct_array(reader):
+        return FStructArray(FRichCurveKey, reader.ndarray(
+            FRichCurveKey.Layout(reader), KEY_COUNT))
+
+    bench(f"{KEY_COUNT} key struct array",
+          run(FPackageReader, FRichCurveKey, keys, 0, KEY_COUNT),
+          run(FPackageReader, struct_array, keys, 0, 1))
+
+    # Struct arrays are decoded lazily, so include converting every element
+    bench(f"{KEY_COUNT} key array tolist",
+          run(FPackageReader, FRichCurveKey, keys, 0, KEY_COUNT),
+          run(FPackageReader, lambda r: struct_array(r).tolist(), keys, 0, 1))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from numpy import array, float32
+from recoil_plot import JsonHook, ONE_THIRD, bezier, deg_to_px, get_error
+from recoil_plot import get_pattern, lerp, smooth_step
+
+# Checks that the array based patterns give exactly the same values as
+# evaluating the curves one bullet at a time did, over random guns.
+
+GUN_COUNT = 300
+
+def random_curve(rng):
+    times = np.cumsum(rng.uniform(0.1, 8, rng.integers(1, 6)))
+    times[0] = 0
+    return [JsonHook(InterpMode=str(rng.choice(["RCIM_Constant",
+                                                "RCIM_Linear",
+                                                "RCIM_Cubic"])),
+                     Time=round(float(time), 3),
+                     Value=float(rng.uniform(-3, 8)),
+                     LeaveTangent=float(rng.uniform(-2, 2)),
+                     ArriveTangent=float(rng.uniform(-2, 2)))
+            for time in times]
+
+def random_gun(seed):
+    """A gun_dump output with random recoil, as recoil_plot loads it."""
+    rng = np.random.default_rng(seed)
+    curve = lambda: JsonHook(FiringCurve=random_curve(rng))
+
+    # Whole numbers can be written as ints, which don't become float32
+    number = lambda low, high: (int(rng.integers(low, high)) if seed % 3 == 0
+                                else float(rng.uniform(low, high)))
+
+    return JsonHook(
+        MagazineAmmo=JsonHook(MaxAmmo=int(rng.integers(10, 40))),
+        FiringState=JsonHook(FiringRate=number(2, 20)),
+        Stability=JsonHook(
+            PitchRecoil=curve(),
+            YawRecoil=curve(),
+            Error=curve(),
+            YawDirectionManipulator=JsonHook(
+                ProtectedBulletCount=int(rng.integers(0, 8)),
+                TimeToSwitchYaw=number(1, 3) if seed % 2 else
+                                float(rng.uniform(0.1, 2)))))
+
+def legacy_eval_curve(curve, time):
+    """eval_curve as it was, scanning for the segment of one time."""
+    time = float32(time)
+
+    if time <= curve[0].Time:
+        return curve[0].Value
+    if time >= curve[-1].Time:
+        return curve[-1].Value
+
+    key1, key2 = next((a, b) for a, b in zip(curve, curve[1:])
+                      if b.Time > time)
+    delta = key2.Time - key1.Time
+    alpha = (time - key1.Time) / delta
+
+    match key1.InterpMode:
+        case 'RCIM_Constant':
+            return key1.Value
+        case 'RCIM_Linear':
+            return lerp(key1.Value, key2.Value, alpha)
+        case 'RCIM_Cubic':
+            return bezier(key1.Value,
+                          key1.Value + (key1.LeaveTangent  * delta * ONE_THIRD),
+                          key2.Value - (key2.ArriveTangent * delta * ONE_THIRD),
+                          key2.Value,
+                          t=alpha)
+
+def legacy_get_pattern(gun, start=None, end=None, *, flip=False, subdivs=1):
+    """get_pattern as it was, one bullet at a time, in px."""
+    stability       = gun.Stability
+    yaw_manipulator = stability.YawDirectionManipulator
+    flip_time       = 0.0
+
+    if start is None:
+        start = int(yaw_manipulator.ProtectedBulletCount + 1) if flip else 0
+
+    if end is None:
+        end = int(gun.MagazineAmmo.MaxAmmo)
+
+    pattern = []
+
+    for n in range(start * subdivs, (end - 1) * subdivs + 1):
+        bullet = n / subdivs
+        pitch  = legacy_eval_curve(stability.PitchRecoil.FiringCurve, bullet)
+        yaw    = legacy_eval_curve(stability.YawRecoil.FiringCurve,   bullet)
+
+        if flip and bullet >= yaw_manipulator.ProtectedBulletCount + 1:
+            fraction = flip_time / yaw_manipulator.TimeToSwitchYaw
+            yaw *= smooth_step(1, -1, min(fraction, 1))
+            flip_time += 1 / gun.FiringState.FiringRate / subdivs
+
+        pitch, yaw = -pitch / 2, -yaw / 2
+        pattern.append((deg_to_px(yaw), deg_to_px(pitch)))
+
+    return array(pattern)
+
+def check_equal(expected, actual):
+    assert expected.shape == actual.shape, f"{expected.shape} != {actual.shape}"
+    mismatches = np.count_nonzero(expected != actual)
+    assert mismatches == 0, f"{mismatches} values differ"
+
+def test_patterns():
+    for seed in range(GUN_COUNT):
+        gun = random_gun(seed)
+        for flip in [False, True]:
+            for start, subdivs in [(None, 1), (0, 10)]:
+                check_equal(legacy_get_pattern(gun, start, flip=flip,
+                                               subdivs=subdivs),
+                            get_pattern(gun, start, flip=flip,
+                                        subdivs=subdivs))
+
+def test_error():
+    for seed in range(GUN_COUNT):
+        gun = random_gun(seed)
+        curve = gun.Stability.Error.FiringCurve
+        expected = [deg_to_px(legacy_eval_curve(curve, n))
+                    for n in range(gun.MagazineAmmo.MaxAmmo)]
+        check_equal(array(expected), get_error(gun))
@@ -0,0 +1,89 @@
+import os
+import sys
+import timeit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gun_dump import AssetManager
+from ue4.properties import UProperty, UArrayProperty, UObjectProperty
+from ue4.properties import UStructProperty
+
+# Benchmark for AssetManager.resolve_references on a deep blueprint chain.
+# The graphs are built directly, without a package, and hold no object
+# references so only the walk itself is timed. Time per node should stay flat
+# as the chain grows.
+
+DEPTH  = 200
+WIDTHS = [2, 4, 8, 16, 32]
+REPEAT = 3
+
+class LegacyAssetManager(AssetManager):
+    """resolve_references as it was with a list of visited objects."""
+    def __init__(self, game_path):
+        super().__init__(game_path)
+        self.visited = []
+
+    def resolve_references(self, reader, obj):
+        if obj in self.visited:
+            return obj
+
+        if isinstance(obj, dict):
+            for key in obj:
+                obj[key] = self.resolve_references(reader, obj[key])
+        elif isinstance(obj, list):
+            for i, value in enumerate(obj):
+                obj[i] = self.resolve_references(reader, value)
+        elif isinstance(obj, UArrayProperty):
+            obj.elems = self.resolve_references(reader, obj.elems)
+        elif isinstance(obj, UStructProperty):
+            obj.fields = self.resolve_references(reader, obj.fields)
+        elif isinstance(obj, UObjectProperty):
+            reader, obj = self.read_object(reader, obj.Index)
+        elif isinstance(obj, UProperty):
+            obj.Data = self.resolve_references(reader, obj.Data)
+
+        self.visited.append(obj)
+        return obj
+
+def make_property(data):
+    prop = UProperty.__new__(UProperty)
+    prop.Data = data
+    return prop
+
+def make_struct(fields):
+    struct = UStructProperty.__new__(UStructProperty)
+    struct.fields = fields
+    return struct
+
+def build_chain(depth, width):
+    """
+    Chain of nested component structs, each with width float properties, a
+    list of width values and the next component. Returns the root and the
+    number of nodes walked.
+    """
+    child = None
+    for level in range(depth):
+        fields = {f"Value{i}": make_property(level + i / width)
+                  for i in range(width)}
+        fields["Values"] = make_property([*range(width)])
+        fields["Child"] = make_property(child)
+        child = make_struct(fields)
+    return make_property(child), depth * (3 * width + 5)
+
+def bench(manager_type, depth, width):
+    def run():
+        manager = manager_type(None)
+        manager.resolve_references(None, root)
+
+    root, nodes = build_chain(depth, width)
+    elapsed = min(timeit.repeat(run, number=1, repeat=REPEAT))
+    print(f"{manager_type.__name__:<20} {nodes:6} nodes "
+          f"{elapsed * 1000:9.2f} ms {elapsed / nodes * 1e6:8.3f} us/node")
+
+def main():
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), DEPTH * 8))
+    for width in WIDTHS:
+        bench(AssetManager, DEPTH, width)
+    for width in WIDTHS[:3]:
+        bench(LegacyAssetManager, DEPTH, width)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
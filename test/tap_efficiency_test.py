@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 import numpy as np
@@ -66,25 +65,56 @@ HEADHUNTER = np.array([[0.09, 1.22], [0.17, 1.31], [0.26, 1.41], [0.34, 1.53],
                        [0.77, 2.21], [0.86, 2.34], [0.95, 2.46], [1.03, 2.56],
                        [1.12, 2.65], [1.20, 2.71], [1.29, 2.74]])
 
+def closest_sample(errors, key, n, margin):
+    """
+    First of the sampled errors closest to key, searched around sample n.
+    The window grows until the samples at both of its ends are further from
+    key than the best one by more than float32 rounding could explain.
+    """
+    lo = hi = n
+    size = 16
+    while True:
+        lo, hi = max(lo - size, 0), min(hi + size, len(errors) - 1)
+        distances = abs(errors[lo:hi + 1] - key)
+        best = distances.argmin()
+        if ((lo == 0 or distances[0] > distances[best] + margin) and
+            (hi == len(errors) - 1 or
+             distances[-1] > distances[best] + margin)):
+            return distances[best], lo + best
+        size *= 2
+
 def get_mapping(curve, samples):
+    """
+    For each sample, the first bullet every 1/SUBDIVS where the curve is
+    closest to it. The closest values can only be near where the curve
+    reaches the sample, near a turning point or at a key, so only errors
+    around those are compared.
+    """
     SUBDIVS = 10000
-    mapping = [(x, (-1, -1)) for x in samples]
-
-    for n in range(int(curve[-1].Time) * SUBDIVS + 1):
-        bullet = n / SUBDIVS
-        error = eval_curve(curve, bullet)
-        for i, (key, (old_x, old_y)) in enumerate(mapping):
-            if abs(error - key) < abs(old_y - key):
-                mapping[i] = (key, (bullet, error))
-
-
-    return [(bullet, error) for (error, (bullet, _)) in mapping]
+    curve = compile_curve(curve)
+    last = int(curve.Times[-1]) * SUBDIVS
+    errors = curve.sample(0, last, SUBDIVS).astype(float)
+    margin = 16 * float(np.spacing(max(abs(curve.Values).max(),
+                                       abs(curve.Control1).max(initial=0),
+                                       abs(curve.Control2).max(initial=0))))
+    points = [0, *curve.Times, *curve.turning_points()]
+
+    mapping = []
+    for key in samples:
+        best = (abs(-1 - key), -1)
+        for time in points + curve.solve(key):
+            n = min(max(round(time * SUBDIVS), 0), last)
+            best = min(best, closest_sample(errors, key, n, margin))
+        bullet = best[1] / SUBDIVS if best[1] != -1 else -1
+        mapping.append((bullet, key))
+
+    return mapping
 
 def main():
     in_path = sys.argv[1]
 
-    with open(in_path, "r") as file:
-        gun = json.load(file, object_hook=JsonHook)
+    with open(in_path, "rb") as file:
+        gun = load_output(file, object_hook=JsonHook)
 
     samples = {
         'Revolver.json':    SHERIFF,
@@ -1,2 +1,4 @@
-from .types import FPackageReader, FName, FString, TArray, FGuid
-from .version import *
\ No newline at end of file
+from .types import FPackageReader, FName, FString, TArray, FGuid, slot_dict
+from .version import *
+from .package import open_package, open_package_header
+from .cache import PackageCache
\ No newline at end of file
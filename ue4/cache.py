@@ -0,0 +1,122 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from .package import package_files, map_file
+from .types import FPackageReader
+
+# Bump whenever the layout of parsed objects changes so old entries are ignored
+CACHE_VERSION = 3
+
+def file_digest(buffer):
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+def file_entry(path, buffer=None):
+    """
+    Get the path, size, mtime and content hash of a file, or only the path
+    if it doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (path, None, None, None)
+    if buffer is None:
+        buffer = map_file(path)
+    return (path, stat.st_size, stat.st_mtime_ns, file_digest(buffer))
+
+def file_changed(entry, buffer=None):
+    """
+    Check whether a file differs from a file_entry() of it. The contents are
+    only hashed if the size matches but the mtime doesn't.
+    """
+    path, size, mtime, digest = entry
+    if size is None:
+        return os.path.exists(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return True
+    if stat.st_size != size:
+        return True
+    if stat.st_mtime_ns == mtime:
+        return False
+    if buffer is None:
+        buffer = map_file(path)
+    return file_digest(buffer) != digest
+
+class PackageCache():
+    """
+    Directory of parsed packages, pickled with every export already read.
+    Entries are keyed by package path and store the size, mtime and content
+    hash of the .uasset/.uexp they were parsed from. An entry is used if the
+    sizes and mtimes still match, or if the mtimes changed but the contents
+    didn't. Otherwise the package is parsed again and the entry replaced.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+
+    def entry_path(self, path):
+        key = hashlib.sha1(os.path.realpath(path).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def open_package(self, path):
+        """open_package() through the cache."""
+        files = [os.path.realpath(file) for file in package_files(path)]
+        buffers = [map_file(file) for file in files]
+
+        reader = self.load(path, files, buffers)
+        if reader is None:
+            uexp = buffers[1] if len(buffers) > 1 else None
+            reader = FPackageReader(buffers[0], uexp=uexp)
+            self.store(path, files, buffers, reader)
+        return reader
+
+    def load(self, path, files, buffers):
+        try:
+            with open(self.entry_path(path), "rb") as f:
+                version, entries = pickle.load(f)
+                if version != CACHE_VERSION or len(entries) != len(files):
+                    return None
+
+                for entry, file, buffer in zip(entries, files, buffers):
+                    if entry[0] != file or file_changed(entry, buffer):
+                        return None
+
+                reader = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as exception:
+            logging.warning(f"Ignoring cache entry for \"{path}\": "
+                            f"{exception!r}")
+            return None
+
+        reader.attach(*buffers)
+        return reader
+
+    def store(self, path, files, buffers, reader):
+        # Exports are read now, before callers get a chance to modify them
+        try:
+            for index in range(1, len(reader.ExportTable) + 1):
+                reader.ReadExport(index)
+        except Exception as exception:
+            logging.warning(f"Not caching \"{path}\": {exception!r}")
+            return
+
+        entries = [file_entry(file, buffer)
+                   for file, buffer in zip(files, buffers)]
+
+        # Written to a temporary file first so that parallel jobs never see
+        # a partial entry
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((CACHE_VERSION, entries), f, protocol=5)
+                pickle.dump(reader, f, protocol=5)
+            os.replace(temp_path, self.entry_path(path))
+        except Exception as exception:
+            logging.warning(f"Not caching \"{path}\": {exception!r}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
\ No newline at end of file
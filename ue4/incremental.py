@@ -0,0 +1,97 @@
+import glob
+import json
+import os
+import tempfile
+from .cache import file_entry, file_changed
+from .jobs import run_jobs
+
+# Bump whenever the log format changes so old logs are ignored
+LOG_VERSION = 2
+
+def source_files():
+    """
+    Get the source files of the ue4 package, which every output depends on.
+    """
+    directory = os.path.dirname(os.path.realpath(__file__))
+    return sorted(glob.glob(os.path.join(directory, "**", "*.py"),
+                            recursive=True))
+
+class DependencyLog():
+    """
+    Input files each output was built from, with their sizes, mtimes and
+    content hashes, saved as JSON. Inputs that were missing are recorded too,
+    so that one appearing makes the output stale. An output is current if it
+    exists and none of its inputs changed since it was built. Every output
+    also depends on the code that built it, and a change there makes every
+    output stale.
+    """
+    def __init__(self, path, code):
+        self.path = path
+        self.code = [os.path.realpath(file) for file in code]
+        self.outputs = {}
+
+        try:
+            with open(path) as f:
+                log = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if log.get("Version") != LOG_VERSION:
+            return
+        code_entries = log.get("Code", [])
+        if [entry[0] for entry in code_entries] != self.code or \
+           any(file_changed(entry) for entry in code_entries):
+            return
+        self.outputs = log.get("Outputs", {})
+
+    def is_current(self, output):
+        entries = self.outputs.get(output)
+        return (entries is not None and os.path.exists(output) and
+                not any(file_changed(entry) for entry in entries))
+
+    def record(self, output, inputs):
+        """Record the files an output was just built from."""
+        inputs = dict.fromkeys(os.path.realpath(path) for path in inputs)
+        self.outputs[output] = [file_entry(path) for path in inputs]
+
+    def discard(self, output):
+        self.outputs.pop(output, None)
+
+    def save(self):
+        log = {"Version": LOG_VERSION,
+               "Code": [file_entry(file) for file in self.code],
+               "Outputs": self.outputs}
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(log, f, indent=4)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+def run_incremental_jobs(function, paths, get_output_path, log, jobs=1):
+    """
+    run_jobs() for only the paths whose output isn't current in a
+    DependencyLog. function(path) returns the input files the output was
+    built from, or None if it failed, and the log is updated and saved.
+    """
+    stale = []
+    for path in paths:
+        if log.is_current(get_output_path(path)):
+            print(f"Unchanged \"{get_output_path(path)}\"")
+        else:
+            stale.append(path)
+
+    for path, inputs in zip(stale, run_jobs(function, stale, jobs)):
+        if inputs is not None:
+            log.record(get_output_path(path), inputs)
+        else:
+            log.discard(get_output_path(path))
+    log.save()
+
+    print(f"Skipped {len(paths) - len(stale)} of {len(paths)} outputs with "
+          f"unchanged inputs, rebuilt {len(stale)}")
\ No newline at end of file
@@ -0,0 +1,90 @@
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+def job_count(value):
+    """Parse a --jobs argument, which can't be negative."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"invalid job count: {value}")
+    return jobs
+
+@contextlib.contextmanager
+def redirect_logging(stream):
+    """Point the stream handlers of the root logger at stream meanwhile."""
+    handlers = [handler for handler in logging.getLogger().handlers
+                if type(handler) is logging.StreamHandler]
+    previous = [handler.setStream(stream) for handler in handlers]
+    try:
+        yield
+    finally:
+        for handler, old in zip(handlers, previous):
+            handler.setStream(old)
+
+def init_worker(level, format, initializer, initargs):
+    """
+    Set up logging in a worker like in the parent, which workers that are
+    spawned instead of forked don't inherit, then run initializer.
+    """
+    logging.basicConfig(format=format, level=level)
+    logging.getLogger().setLevel(level)
+    if initializer is not None:
+        initializer(*initargs)
+
+def run_job(function, path):
+    """
+    Run function(path) and return its result, reporting any exception instead
+    of raising it and returning None.
+    """
+    try:
+        return function(path)
+    except:
+        print(f"Exception while processing {os.path.basename(path)}:")
+        traceback.print_exc()
+
+def run_captured_job(function, path):
+    """
+    Run a job in a worker process and return its stdout/stderr output,
+    including what it logs.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), \
+         contextlib.redirect_stderr(stderr), redirect_logging(stderr):
+        result = run_job(function, path)
+    return stdout.getvalue(), stderr.getvalue(), result
+
+def run_jobs(function, paths, jobs=1, initializer=None, initargs=()):
+    """
+    Run function(path) for each path, in a pool of worker processes if jobs
+    isn't 1 (0 uses every core). Each job's output is printed in the order of
+    paths once it finishes, and an exception only fails its own job. Returns
+    the results in the order of paths, None for failed jobs.
+
+    initializer(*initargs) is called once in each worker, or once before the
+    jobs if they run in this process, to set up state shared by its jobs.
+    """
+    if jobs == 1 or len(paths) <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [run_job(function, path) for path in paths]
+
+    root = logging.getLogger()
+    format = next((handler.formatter._fmt for handler in root.handlers
+                   if handler.formatter is not None), None)
+
+    results = []
+    with ProcessPoolExecutor(jobs or None, initializer=init_worker,
+                             initargs=(root.level, format, initializer,
+                                       initargs)) as executor:
+        job = partial(run_captured_job, function)
+        for stdout, stderr, result in executor.map(job, paths):
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            results.append(result)
+    return results
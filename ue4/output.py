@@ -0,0 +1,139 @@
+import json
+import struct
+from enum import Enum
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+F32 = struct.Struct("<f")
+
+# Rounded values of recently formatted floats. Zeros are left out since 0.0
+# and -0.0 are the same key.
+ROUND_CACHE = {}
+ROUND_CACHE_SIZE = 0x10000
+
+# Extensions of the output formats the exporters can write
+OUTPUT_EXTENSIONS = {"json": ".json", "msgpack": ".msgpack"}
+
+# MessagePack extension type of NumPy arrays
+NDARRAY_EXT = 1
+
+# Arrays shorter than this are rounded one value at a time, since finding
+# the unique values costs more than it saves
+BULK_MIN_SIZE = 64
+
+def round_float32_slow(value):
+    with np.errstate(over="ignore"):
+        return next((r for r in (round(value, n) for n in range(10))
+                            if np.float32(value) == np.float32(r)), value)
+
+def round_float32(value):
+    """
+    Round a float to the fewest decimal places (up to 9) that still give the
+    same float32, e.g. 0.10000000149011612 to 0.1. Returns the value as is if
+    no rounding does.
+    """
+    if value in ROUND_CACHE:
+        return ROUND_CACHE[value]
+
+    try:
+        (target,) = F32.unpack(F32.pack(value))
+        result = value
+        for n in range(10):
+            r = round(value, n)
+            if F32.unpack(F32.pack(r))[0] == target:
+                result = r
+                break
+    except OverflowError:
+        # Out of float32 range, where struct refuses to round to infinity
+        result = round_float32_slow(value)
+
+    if value != 0:
+        if len(ROUND_CACHE) >= ROUND_CACHE_SIZE:
+            ROUND_CACHE.clear()
+        ROUND_CACHE[value] = result
+    return result
+
+def round_float32_array(array):
+    """round_float32() of every value in a float array, as a list."""
+    if len(array) < BULK_MIN_SIZE:
+        return [round_float32(value) for value in array.tolist()]
+
+    # Unique by bit pattern so that 0.0 and -0.0 (and NaNs) stay apart
+    bits = array.view(f"u{array.dtype.itemsize}")
+    unique, inverse = np.unique(bits, return_inverse=True)
+    rounded = np.empty(len(unique), dtype=object)
+    rounded[:] = [round_float32(value)
+                  for value in unique.view(array.dtype).tolist()]
+    return rounded[inverse.reshape(-1)].tolist()
+
+def struct_array_rows(array):
+    """
+    Elements of an FStructArray as dicts ready for JSON, the same as the
+    exporters' json_default makes of each element: floats rounded with
+    round_float32() and enums replaced by their names.
+    """
+    names = array.Data.dtype.names
+    columns = []
+    for name in names:
+        column = array.Data[name]
+        if column.dtype.kind == "f":
+            # Strided view of one field, copied so it can be viewed as bits
+            columns.append(round_float32_array(np.ascontiguousarray(column)))
+        else:
+            columns.append([value._name_ if isinstance(value, Enum) else value
+                            for value in array.column(name)])
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+def json_output_default(default):
+    """
+    Wrap an exporter's json_default for json.dump. json_default leaves NumPy
+    arrays as they are for the output format to write, here as lists.
+    """
+    def output_default(obj):
+        obj = default(obj)
+        return obj.tolist() if isinstance(obj, np.ndarray) else obj
+    return output_default
+
+def msgpack_output_default(default):
+    """
+    Wrap an exporter's json_default for msgpack.Packer. NumPy arrays are
+    written as raw typed buffers instead of lists of numbers.
+    """
+    def output_default(obj):
+        obj = default(obj)
+        if isinstance(obj, np.ndarray):
+            data = msgpack.packb([obj.dtype.str, list(obj.shape),
+                                  np.ascontiguousarray(obj).data])
+            return msgpack.ExtType(NDARRAY_EXT, data)
+        return obj
+    return output_default
+
+def msgpack_packer(default):
+    """msgpack.Packer for an exporter's json_default."""
+    if msgpack is None:
+        raise ImportError("msgpack is needed to write MessagePack outputs")
+    return msgpack.Packer(default=msgpack_output_default(default))
+
+def msgpack_ext_hook(code, data):
+    if code == NDARRAY_EXT:
+        dtype, shape, buffer = msgpack.unpackb(data)
+        return np.frombuffer(buffer, dtype).reshape(shape)
+    return msgpack.ExtType(code, data)
+
+def load_output(file, object_hook=None):
+    """
+    Load a JSON or MessagePack output of the exporters from a binary file,
+    depending on its extension. Numeric arrays in MessagePack outputs are
+    read back as read-only NumPy arrays.
+    """
+    if not file.name.endswith(".msgpack"):
+        return json.load(file, object_hook=object_hook)
+
+    if msgpack is None:
+        raise ImportError("msgpack is needed to load MessagePack outputs")
+    return msgpack.unpack(file, object_hook=object_hook, strict_map_key=False,
+                          ext_hook=msgpack_ext_hook)
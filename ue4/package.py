@@ -0,0 +1,60 @@
+import mmap
+import os
+import struct
+from .types import BinaryReader, FPackageFileSummary, FPackageReader
+
+# Bytes read up front by open_package_header(), enough for the summary of
+# nearly every package
+HEADER_READ_SIZE = 0x4000
+
+def map_file(path):
+    """Map a file read only, without copying it into memory."""
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return f.read()
+
+def package_files(path):
+    """Get the files of a package: the .uasset/.umap and its .uexp if any."""
+    root, ext = os.path.splitext(path)
+    if ext in [".uasset", ".umap"] and os.path.exists(f"{root}.uexp"):
+        return [path, f"{root}.uexp"]
+    return [path]
+
+def map_package(path):
+    """Map the files of a package, returning the .uasset and .uexp or None."""
+    buffers = [map_file(file) for file in package_files(path)]
+    return buffers[0], buffers[1] if len(buffers) > 1 else None
+
+def open_package(path):
+    """Open a .uasset/.umap, mapping its .uexp alongside if there is one."""
+    uasset, uexp = map_package(path)
+    return FPackageReader(uasset, uexp=uexp)
+
+def open_package_header(path):
+    """
+    Open only the header of a .uasset/.umap: the summary and the name, import
+    and export tables, which end at HeadersSize. Nothing past that is read,
+    the .uexp isn't opened and exports can't be read, but can still be found
+    in the export table.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_READ_SIZE)
+        while True:
+            try:
+                summary = FPackageFileSummary(BinaryReader(header))
+                break
+            except struct.error:
+                # Summary longer than what was read so far
+                if not (more := f.read(len(header))):
+                    raise
+                header += more
+
+        if summary.HeadersSize > len(header):
+            header += f.read(summary.HeadersSize - len(header))
+
+    reader = FPackageReader(header)
+    reader.HeaderOnly = True
+    return reader
\ No newline at end of file
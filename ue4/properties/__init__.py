@@ -1,4 +1,5 @@
 from .arrayproperty import UArrayProperty
+from .export import read_export, EXPORT_TYPE_MAP
 from .fieldpathproperty import FFieldPathProperty
 from .objectproperty import UObjectProperty
 from .structproperty import UStructProperty
@@ -1,12 +1,30 @@
+from ue4 import slot_dict
+from ue4.structs import STRUCT_TYPE_MAP, FStructArray
 from .property import FPropertyTag, UProperty, PROPERTY_TYPE_MAP
 
 class UArrayProperty:
+    __slots__ = ("StructName", "elems")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         Length = reader.s32()
         InnerTag = FPropertyTag(reader)
-        self.elems = [UProperty(reader, InnerTag) for _ in range(Length)]
+        self.StructName = InnerTag.StructName
+
+        struct_type = STRUCT_TYPE_MAP.get(InnerTag.StructName)
+        if hasattr(struct_type, "Layout"):
+            # Fixed layout structs are decoded in one go
+            if reader.Trace:
+                UProperty.debug(f"Struct array @ {reader.offset_string()}: "
+                                f"{Length} x {InnerTag.StructName}")
+            self.elems = FStructArray(
+                struct_type, reader.ndarray(struct_type.Layout(reader), Length))
+        else:
+            self.elems = [UProperty(reader, InnerTag) for _ in range(Length)]
 
     def __getitem__(self, index):
+        if isinstance(self.elems, FStructArray):
+            return self.elems[index]
         return self.elems[index].Data
 
     def __len__(self):
@@ -0,0 +1,35 @@
+import logging
+from ue4 import FName, FString
+from .structproperty import UStructProperty
+
+def UDataTable(reader):
+    obj = UStructProperty(reader)
+    reader.s32()
+    NumRows = reader.s32()
+    obj.RowMap = {FName(reader): UStructProperty(reader)
+                  for _ in range(NumRows)}
+    return obj
+
+def UStringTable(reader):
+    UStructProperty(reader)
+    reader.s32()
+    Name = FString(reader)
+    NumEntries = reader.s32()
+    return {FString(reader): FString(reader) for _ in range(NumEntries)}
+
+EXPORT_TYPE_MAP = {
+    "DataTable": UDataTable,
+    "StringTable": UStringTable
+}
+
+def read_export(reader, index):
+    """Deserialize an export, dispatching on its class name."""
+    export = reader.ExportTable[index - 1]
+    reader.seek(export.SerialOffset)
+    if reader.Trace:
+        logging.debug(f"Export {reader.GetObjectFullName(index)} @ "
+                      f"{reader.offset_string()} "
+                      f"size {export.SerialSize:08X}")
+    handler = EXPORT_TYPE_MAP.get(reader.GetObjectName(export.ClassIndex),
+                                  UStructProperty)
+    return handler(reader)
\ No newline at end of file
@@ -1,8 +1,11 @@
-from ue4 import TArray, FName
+from ue4 import TArray, FName, slot_dict
 from .objectproperty import UObjectProperty
 from .property import PROPERTY_TYPE_MAP
 
 class FFieldPathProperty:
+    __slots__ = ("Path", "Owner")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         self.Path = TArray(reader, FName)
         self.Owner = UObjectProperty(reader)
@@ -1,6 +1,10 @@
+from ue4 import slot_dict
 from .property import PROPERTY_TYPE_MAP
 
 class UObjectProperty:
+    __slots__ = ("Index",)
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         self.Index = reader.s32()
 
@@ -1,5 +1,6 @@
 import logging
-from ue4 import FName, FGuid, FString, FPackageReader
+from ue4 import FName, FGuid, FString, FPackageReader, slot_dict
+from ue4.types import FNameString
 from ue4.structs import STRUCT_TYPE_MAP
 
 PROPERTY_TYPE_MAP = {
@@ -18,34 +19,58 @@ PROPERTY_TYPE_MAP = {
     "SoftObjectProperty": lambda r: f"{FName(r)}-{r.s32()}"
 }
 
+# Inner types of primitive arrays that are decoded in one go as NumPy arrays
+ARRAY_DTYPE_MAP = {
+    "BoolProperty": "?",
+    "ByteProperty": "u1",
+    "Int16Property": "<i2",
+    "UInt16Property": "<u2",
+    "IntProperty": "<i4",
+    "UInt32Property": "<u4",
+    "Int64Property": "<i8",
+    "UInt64Property": "<u8",
+    "FloatProperty": "<f4"
+}
+
 class FPropertyTag():
+    __slots__ = ("Name", "Type", "Size", "ArrayIndex", "StructName",
+                 "StructGuid", "BoolVal", "EnumName", "InnerType", "ValueType",
+                 "HasPropertyGuid", "PropertyGuid")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
-        self.Name = FName(reader)
+        # Property and type names are plain name table strings, shared by
+        # every tag with the same name, so that dispatching on them never
+        # builds a string
+        self.Name = FNameString(reader)
         if self.Name == "None":
+            self.Type = None
             return
 
-        self.Type = FName(reader)
-        self.Size = reader.u32()
-        self.ArrayIndex = reader.u32()
+        self.Type = FNameString(reader)
+        self.Size, self.ArrayIndex = reader.unpack("<II")
 
         if self.Type == "StructProperty":
-            self.StructName = FName(reader)
+            self.StructName = FNameString(reader)
             self.StructGuid = FGuid(reader)
         elif self.Type == "BoolProperty":
             self.BoolVal = reader.bool()
         elif self.Type in ["ByteProperty", "EnumProperty"]:
             self.EnumName = FName(reader)
         elif self.Type in ["ArrayProperty", "SetProperty"]:
-            self.InnerType = FName(reader)
+            self.InnerType = FNameString(reader)
         elif self.Type == "MapProperty":
-            self.InnerType = FName(reader)
-            self.ValueType = FName(reader)
+            self.InnerType = FNameString(reader)
+            self.ValueType = FNameString(reader)
 
         self.HasPropertyGuid = reader.bool()
         if self.HasPropertyGuid:
             self.PropertyGuid = FGuid(reader)
 
 class FDummyTag():
+    __slots__ = ("Name", "Type", "Size", "ArrayIndex", "StructName", "BoolVal")
+    __dict__ = property(slot_dict)
+
     def __init__(self, type):
         self.Name = None
         self.Type = type
@@ -55,21 +80,39 @@ class FDummyTag():
             self.StructName = ""
 
 class UProperty():
+    # Millions of these make up a large package, so they have no __dict__
+    __slots__ = ("Name", "Type", "ArrayIndex", "StructName", "InnerType",
+                 "ValueType", "Data")
+    __dict__ = property(slot_dict)
+
     IndentLevel = 0
 
     @staticmethod
     def debug(msg, *args, **kwargs):
         logging.debug(f"{'    ' * UProperty.IndentLevel}{msg}", *args, **kwargs)
 
+    @staticmethod
+    def trace(reader, tag, offset, tag_start):
+        if tag.Type == "StructProperty":
+            display_type = f"struct {tag.StructName}"
+        else:
+            display_type = tag.Type
+
+        # Tags passed in by the caller weren't read here
+        tag_size = reader.tell() - tag_start if tag_start is not None else 0
+
+        UProperty.debug(f"Property @ {offset} "
+                        f"tag size {tag_size:04X} size {tag.Size:04X}: "
+                        f"{display_type} {tag.Name}")
+
     def __init__(self, reader, tag=None):
-        offset = reader.offset_string()
-        tag_size = 0
+        if reader.Trace:
+            offset = reader.offset_string()
+            tag_start = reader.tell() if tag is None else None
 
         if tag is None:
-            tag_start = reader.tell()
             tag = FPropertyTag(reader)
-            tag_size = reader.tell() - tag_start
-            if tag.Name == "None":
+            if tag.Type is None:
                 self.Name = "None"
                 self.Type = "None"
                 self.ArrayIndex = 0
@@ -79,14 +122,8 @@ class UProperty():
             # Tagless bools in MapProperty
             tag.BoolVal = reader.bool()
 
-        if tag.Type == "StructProperty":
-            display_type = f"struct {tag.StructName}"
-        else:
-            display_type = tag.Type
-
-        UProperty.debug(f"Property @ {offset} "
-                        f"tag size {tag_size:04X} size {tag.Size:04X}: "
-                        f"{display_type} {tag.Name}")
+        if reader.Trace:
+            UProperty.trace(reader, tag, offset, tag_start)
 
         self.Name = tag.Name
         self.Type = tag.Type
@@ -126,10 +163,11 @@ class UProperty():
 
             NumEntries = reader.s32()
 
-            UProperty.debug(f"InnerType {tag.InnerType} "
-                            f"ValueType {tag.ValueType} "
-                            f"NumEntries {NumEntries} "
-                            f"NumKeysToRemove {NumKeysToRemove}")
+            if reader.Trace:
+                UProperty.debug(f"InnerType {tag.InnerType} "
+                                f"ValueType {tag.ValueType} "
+                                f"NumEntries {NumEntries} "
+                                f"NumKeysToRemove {NumKeysToRemove}")
 
             self.Data = {
                 UProperty(reader, key_tag).Data: UProperty(reader, value_tag)
@@ -148,11 +186,12 @@ class UProperty():
         if tag.Type == "ArrayProperty" and tag.InnerType != "StructProperty":
             # Primitive array
             Length = reader.s32()
-            if tag.InnerType == "ByteProperty":
-                handler = FPackageReader.u8
+            if tag.InnerType in ARRAY_DTYPE_MAP:
+                self.Data = reader.ndarray(ARRAY_DTYPE_MAP[tag.InnerType],
+                                           Length)
             else:
                 handler = PROPERTY_TYPE_MAP[tag.InnerType]
-            self.Data = [handler(reader) for _ in range(Length)]
+                self.Data = [handler(reader) for _ in range(Length)]
             UProperty.IndentLevel -= 1
             return
 
@@ -3,11 +3,15 @@ from ue4 import FName
 from ue4.structs import STRUCT_TYPE_MAP
 
 class UStructProperty:
+    # Other attributes, like RowMap of data tables, go in a __dict__ that is
+    # only made for the objects that get one
+    __slots__ = ("fields", "__dict__")
+
     def __init__(self, reader):
         self.fields = {}
         while True:
             field = UProperty(reader)
-            name = field.Name
+            name = str(field.Name)
 
             if name == "None":
                 break
@@ -35,6 +39,9 @@ class UStructProperty:
         return self.fields[name].Data
 
     def __getattr__(self, name):
+        if name == "fields":
+            # Not set yet while unpickling
+            raise AttributeError(name)
         return self[name]
 
 PROPERTY_TYPE_MAP["StructProperty"] = UStructProperty
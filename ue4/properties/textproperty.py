@@ -1,4 +1,4 @@
-from ue4 import FString, FName
+from ue4 import FString, FName, slot_dict
 from .property import UProperty, PROPERTY_TYPE_MAP
 from enum import Enum
 
@@ -8,6 +8,10 @@ class ETextHistoryType(Enum):
     StringTableEntry = 11
 
 class UTextProperty():
+    __slots__ = ("CultureInvariantString", "TableId", "Namespace", "Key",
+                 "SourceString")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         Flags = reader.s32()
         HistoryType = ETextHistoryType(reader.u8())
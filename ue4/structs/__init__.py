@@ -5,4 +5,5 @@ from .vector import FVector, FVector2D, FVector4, FIntPoint
 from .quat import FQuat
 from .color import FColor, FLinearColor
 from .gameplaytagcontainer import FGameplayTagContainer
+from .structarray import FStructArray, FStructView
 from .types import STRUCT_TYPE_MAP
\ No newline at end of file
@@ -1,13 +1,27 @@
+import numpy as np
+from ue4 import slot_dict
+
+COLOR_DTYPE        = np.dtype([(field, "u1") for field in "RGBA"])
+LINEAR_COLOR_DTYPE = np.dtype([(field, "<f4") for field in "RGBA"])
+
 class FColor():
+    __slots__ = ("R", "G", "B", "A")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return COLOR_DTYPE
+
     def __init__(self, reader):
-        self.R = reader.u8()
-        self.G = reader.u8()
-        self.B = reader.u8()
-        self.A = reader.u8()
+        self.R, self.G, self.B, self.A = reader.unpack("<4B")
 
 class FLinearColor():
+    __slots__ = ("R", "G", "B", "A")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return LINEAR_COLOR_DTYPE
+
     def __init__(self, reader):
-        self.R = reader.f32()
-        self.G = reader.f32()
-        self.B = reader.f32()
-        self.A = reader.f32()
\ No newline at end of file
+        self.R, self.G, self.B, self.A = reader.unpack("<4f")
\ No newline at end of file
@@ -1,3 +1,8 @@
+from ue4 import slot_dict
+
 class FFrameNumber():
+    __slots__ = ("Value",)
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         self.Value = reader.s32()
\ No newline at end of file
@@ -1,5 +1,8 @@
-from ue4 import TArray, FName
+from ue4 import TArray, FName, slot_dict
 
 class FGameplayTagContainer():
+    __slots__ = ("GameplayTags",)
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         self.GameplayTags = TArray(reader, FName)
\ No newline at end of file
@@ -1,6 +1,8 @@
+from ue4 import slot_dict
+
 class FMovieSceneFrameRange():
+    __slots__ = ("LowerBound", "UpperBound")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
-        reader.bool()
-        self.LowerBound = reader.s32()
-        reader.bool()
-        self.UpperBound = reader.s32()
\ No newline at end of file
+        _, self.LowerBound, _, self.UpperBound = reader.unpack("<?i?i")
\ No newline at end of file
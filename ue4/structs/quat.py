@@ -1,6 +1,15 @@
+import numpy as np
+from ue4 import slot_dict
+
+QUAT_DTYPE = np.dtype([(field, "<f4") for field in "XYZW"])
+
 class FQuat():
+    __slots__ = ("X", "Y", "Z", "W")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return QUAT_DTYPE
+
     def __init__(self, reader):
-        self.X = reader.f32()
-        self.Y = reader.f32()
-        self.Z = reader.f32()
-        self.W = reader.f32()
\ No newline at end of file
+        self.X, self.Y, self.Z, self.W = reader.unpack("<4f")
\ No newline at end of file
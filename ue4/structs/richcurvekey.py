@@ -1,4 +1,6 @@
 from enum import Enum
+import numpy as np
+from ue4 import slot_dict
 
 class ERichCurveInterpMode(Enum):
     RCIM_Linear = 0
@@ -18,14 +20,33 @@ class ERichCurveTangentWeightMode(Enum):
     RCTWM_WeightedLeave = 2
     RCTWM_WeightedBoth = 3
 
+RICH_CURVE_KEY_DTYPE = np.dtype([
+    ("InterpMode", "u1"), ("TangentMode", "u1"), ("TangentWeightMode", "u1"),
+    ("Time", "<f4"), ("Value", "<f4"),
+    ("ArriveTangent", "<f4"), ("ArriveTangentWeight", "<f4"),
+    ("LeaveTangent", "<f4"), ("LeaveTangentWeight", "<f4")])
+
 class FRichCurveKey():
+    __slots__ = ("InterpMode", "TangentMode", "TangentWeightMode", "Time",
+                 "Value", "ArriveTangent", "ArriveTangentWeight",
+                 "LeaveTangent", "LeaveTangentWeight")
+    __dict__ = property(slot_dict)
+
+    # Enum fields of the structured array layout
+    Enums = {"InterpMode": ERichCurveInterpMode,
+             "TangentMode": ERichCurveTangentMode,
+             "TangentWeightMode": ERichCurveTangentWeightMode}
+
+    @staticmethod
+    def Layout(reader):
+        return RICH_CURVE_KEY_DTYPE
+
     def __init__(self, reader):
-        self.InterpMode = ERichCurveInterpMode(reader.u8())
-        self.TangentMode = ERichCurveTangentMode(reader.u8())
-        self.TangentWeightMode = ERichCurveTangentWeightMode(reader.u8())
-        self.Time = reader.f32()
-        self.Value = reader.f32()
-        self.ArriveTangent = reader.f32()
-        self.ArriveTangentWeight = reader.f32()
-        self.LeaveTangent = reader.f32()
-        self.LeaveTangentWeight = reader.f32()
\ No newline at end of file
+        (self.InterpMode, self.TangentMode, self.TangentWeightMode,
+         self.Time, self.Value,
+         self.ArriveTangent, self.ArriveTangentWeight,
+         self.LeaveTangent, self.LeaveTangentWeight) = reader.unpack("<3B6f")
+        self.InterpMode = ERichCurveInterpMode(self.InterpMode)
+        self.TangentMode = ERichCurveTangentMode(self.TangentMode)
+        self.TangentWeightMode = ERichCurveTangentWeightMode(
+            self.TangentWeightMode)
\ No newline at end of file
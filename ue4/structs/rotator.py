@@ -1,5 +1,15 @@
+import numpy as np
+from ue4 import slot_dict
+
+ROTATOR_DTYPE = np.dtype([("Pitch", "<f4"), ("Yaw", "<f4"), ("Roll", "<f4")])
+
 class FRotator():
+    __slots__ = ("Pitch", "Yaw", "Roll")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return ROTATOR_DTYPE
+
     def __init__(self, reader):
-        self.Pitch = reader.f32()
-        self.Yaw = reader.f32()
-        self.Roll = reader.f32()
\ No newline at end of file
+        self.Pitch, self.Yaw, self.Roll = reader.unpack("<3f")
\ No newline at end of file
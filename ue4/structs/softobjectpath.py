@@ -1,6 +1,9 @@
-from ue4 import FName, FString
+from ue4 import FName, FString, slot_dict
 
 class FSoftObjectPath():
+    __slots__ = ("AssetPathName", "SubPathString")
+    __dict__ = property(slot_dict)
+
     def __init__(self, reader):
         self.AssetPathName = FName(reader)
         self.SubPathString = FString(reader)
\ No newline at end of file
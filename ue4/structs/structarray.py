@@ -0,0 +1,64 @@
+class FStructArray():
+    """
+    Array of a struct type with a fixed binary layout, decoded in one go into
+    a NumPy structured array. Struct types opt in with a Layout(reader)
+    staticmethod returning the dtype matching their __init__, and an optional
+    Enums dict of fields to convert.
+
+    Elements are views with the attributes of the struct type (keys[0].Time)
+    and keys["Time"] is the whole column as a NumPy array.
+    """
+    def __init__(self, struct_type, data):
+        self.StructType = struct_type
+        self.Data = data
+        self.Columns = {}
+
+    def column(self, name):
+        """Values of a field as Python objects, with enums converted."""
+        if name not in self.Columns:
+            values = self.Data[name].tolist()
+            if enum := getattr(self.StructType, "Enums", {}).get(name):
+                members = {member.value: member for member in enum}
+                values = [members[value] for value in values]
+            self.Columns[name] = values
+        return self.Columns[name]
+
+    def tolist(self):
+        """Elements as dicts of field values, in layout order."""
+        names = self.Data.dtype.names
+        columns = [self.column(name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def __getitem__(self, index):
+        if isinstance(index, str):
+            return self.Data[index]
+        if index < 0:
+            index += len(self.Data)
+        if not 0 <= index < len(self.Data):
+            raise IndexError("struct array index out of range")
+        return FStructView(self, index)
+
+    def __iter__(self):
+        return (FStructView(self, i) for i in range(len(self.Data)))
+
+    def __len__(self):
+        return len(self.Data)
+
+class FStructView():
+    """Element of an FStructArray."""
+    __slots__ = ("Array", "Index")
+
+    def __init__(self, array, index):
+        self.Array = array
+        self.Index = index
+
+    def __getattr__(self, name):
+        if name in FStructView.__slots__ or \
+           name not in self.Array.Data.dtype.names:
+            raise AttributeError(name)
+        return self.Array.column(name)[self.Index]
+
+    @property
+    def __dict__(self):
+        return {name: self.Array.column(name)[self.Index]
+                for name in self.Array.Data.dtype.names}
\ No newline at end of file
@@ -1,39 +1,68 @@
-from ue4 import VER_UE5_LARGE_WORLD_COORDINATES
+import numpy as np
+from ue4 import VER_UE5_LARGE_WORLD_COORDINATES, slot_dict
+
+def vector_dtypes(fields):
+    """Single and double precision layouts of a float vector struct."""
+    return (np.dtype([(field, "<f4") for field in fields]),
+            np.dtype([(field, "<f8") for field in fields]))
+
+VECTOR_DTYPES   = vector_dtypes("XYZ")
+VECTOR2D_DTYPES = vector_dtypes("XY")
+VECTOR4_DTYPES  = vector_dtypes("XYZW")
+INT_POINT_DTYPE = np.dtype([("X", "<i4"), ("Y", "<i4")])
 
 class FVector():
+    __slots__ = ("X", "Y", "Z")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        lwc = reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES
+        return VECTOR_DTYPES[lwc]
+
     def __init__(self, reader):
         if reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES:
-            self.X = reader.f64()
-            self.Y = reader.f64()
-            self.Z = reader.f64()
+            self.X, self.Y, self.Z = reader.unpack("<3d")
         else:
-            self.X = reader.f32()
-            self.Y = reader.f32()
-            self.Z = reader.f32()
+            self.X, self.Y, self.Z = reader.unpack("<3f")
 
 class FVector2D():
+    __slots__ = ("X", "Y")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        lwc = reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES
+        return VECTOR2D_DTYPES[lwc]
+
     def __init__(self, reader):
         if reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES:
-            self.X = reader.f64()
-            self.Y = reader.f64()
+            self.X, self.Y = reader.unpack("<2d")
         else:
-            self.X = reader.f32()
-            self.Y = reader.f32()
+            self.X, self.Y = reader.unpack("<2f")
 
 class FVector4():
+    __slots__ = ("X", "Y", "Z", "W")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        lwc = reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES
+        return VECTOR4_DTYPES[lwc]
+
     def __init__(self, reader):
         if reader.Summary.VersionUE5 >= VER_UE5_LARGE_WORLD_COORDINATES:
-            self.X = reader.f64()
-            self.Y = reader.f64()
-            self.Z = reader.f64()
-            self.W = reader.f64()
+            self.X, self.Y, self.Z, self.W = reader.unpack("<4d")
         else:
-            self.X = reader.f32()
-            self.Y = reader.f32()
-            self.Z = reader.f32()
-            self.W = reader.f32()
+            self.X, self.Y, self.Z, self.W = reader.unpack("<4f")
 
 class FIntPoint():
+    __slots__ = ("X", "Y")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return INT_POINT_DTYPE
+
     def __init__(self, reader):
-        self.X = reader.s32()
-        self.Y = reader.s32()
\ No newline at end of file
+        self.X, self.Y = reader.unpack("<2i")
\ No newline at end of file
@@ -1,15 +1,34 @@
 from collections import UserString
 from .version import *
+import logging
+import numpy as np
 import struct
 
 PACKAGE_FILE_TAG = 0x9E2A83C1
 
 PKG_FilterEditorOnly = 0x80000000
 
+BOOL = struct.Struct("?")
+S8   = struct.Struct("b")
+U8   = struct.Struct("B")
+S16  = struct.Struct("<h")
+U16  = struct.Struct("<H")
+S32  = struct.Struct("<i")
+U32  = struct.Struct("<I")
+S64  = struct.Struct("<q")
+U64  = struct.Struct("<Q")
+F32  = struct.Struct("<f")
+F64  = struct.Struct("<d")
+
+NAME_HASHES = struct.Struct("<HH")
+
 class InvalidPackageMagic(Exception):
     pass
 
 class BinaryReader():
+    # Precompiled layouts shared by every reader, keyed by format string
+    STRUCTS = {}
+
     def __init__(self, buffer, offset=0):
         self.buffer = buffer
         self.offset = offset
@@ -23,72 +42,107 @@ class BinaryReader():
     def tell(self):
         return self.offset
 
+    def unpack(self, fmt):
+        """Read a fixed layout record in one call, e.g. unpack("<4I")."""
+        try:
+            layout = BinaryReader.STRUCTS[fmt]
+        except KeyError:
+            layout = BinaryReader.STRUCTS[fmt] = struct.Struct(fmt)
+        result = layout.unpack_from(self.buffer, self.offset)
+        self.offset += layout.size
+        return result
+
     def bool(self):
-        (result,) = struct.unpack_from("?", self.buffer, self.offset)
+        (result,) = BOOL.unpack_from(self.buffer, self.offset)
         self.offset += 1
         return result
 
     def s8(self):
-        (result,) = struct.unpack_from("b", self.buffer, self.offset)
+        (result,) = S8.unpack_from(self.buffer, self.offset)
         self.offset += 1
         return result
 
     def u8(self):
-        (result,) = struct.unpack_from("B", self.buffer, self.offset)
+        (result,) = U8.unpack_from(self.buffer, self.offset)
         self.offset += 1
         return result
 
     def s16(self):
-        (result,) = struct.unpack_from("<h", self.buffer, self.offset)
+        (result,) = S16.unpack_from(self.buffer, self.offset)
         self.offset += 2
         return result
 
     def u16(self):
-        (result,) = struct.unpack_from("<H", self.buffer, self.offset)
+        (result,) = U16.unpack_from(self.buffer, self.offset)
         self.offset += 2
         return result
 
     def s32(self):
-        (result,) = struct.unpack_from("<i", self.buffer, self.offset)
+        (result,) = S32.unpack_from(self.buffer, self.offset)
         self.offset += 4
         return result
 
     def u32(self):
-        (result,) = struct.unpack_from("<I", self.buffer, self.offset)
+        (result,) = U32.unpack_from(self.buffer, self.offset)
         self.offset += 4
         return result
 
     def s64(self):
-        (result,) = struct.unpack_from("<q", self.buffer, self.offset)
+        (result,) = S64.unpack_from(self.buffer, self.offset)
         self.offset += 8
         return result
 
     def u64(self):
-        (result,) = struct.unpack_from("<Q", self.buffer, self.offset)
+        (result,) = U64.unpack_from(self.buffer, self.offset)
         self.offset += 8
         return result
 
     def f32(self):
-        (result,) = struct.unpack_from("<f", self.buffer, self.offset)
+        (result,) = F32.unpack_from(self.buffer, self.offset)
         self.offset += 4
         return result
 
     def f64(self):
-        (result,) = struct.unpack_from("<d", self.buffer, self.offset)
+        (result,) = F64.unpack_from(self.buffer, self.offset)
         self.offset += 8
         return result
 
+    def ndarray(self, dtype, count):
+        """Read an array of fixed width values without copying the buffer."""
+        result = np.frombuffer(self.buffer, dtype, count, self.offset)
+        self.offset += result.nbytes
+        return result
+
     def string(self, size):
-        (result,) = struct.unpack_from(f"{size}s", self.buffer, self.offset)
+        result = bytes(self.buffer[self.offset:self.offset + size])
+        if len(result) != size:
+            raise struct.error(f"string of size {size} out of range")
         self.offset += size
         return result
 
+    def array(self, type, count):
+        return [type(self) for _ in range(count)]
+
+def slot_dict(obj):
+    """
+    The attributes set on an object with __slots__, in slot order, as its
+    __dict__ would have them.
+    """
+    return {name: getattr(obj, name) for name in type(obj).__slots__
+            if hasattr(obj, name)}
+
+GUID_DTYPE = np.dtype([(field, "<u4") for field in "ABCD"])
+
 class FGuid():
+    __slots__ = ("A", "B", "C", "D")
+    __dict__ = property(slot_dict)
+
+    @staticmethod
+    def Layout(reader):
+        return GUID_DTYPE
+
     def __init__(self, reader):
-        self.A = reader.u32()
-        self.B = reader.u32()
-        self.C = reader.u32()
-        self.D = reader.u32()
+        self.A, self.B, self.C, self.D = reader.unpack("<4I")
 
     def __str__(self):
         return f"{self.A:08X}-{self.B:08X}-{self.C:08X}-{self.D:08X}"
@@ -155,40 +209,32 @@ class FPackageFileSummary():
             self.GatherableTextDataCount = 0
             self.GatherableTextDataOffset = 0
 
-        self.ExportCount = reader.u32()
-        self.ExportOffset = reader.u32()
-        self.ImportCount = reader.u32()
-        self.ImportOffset = reader.u32()
-        self.DependsOffset = reader.u32()
+        (self.ExportCount, self.ExportOffset,
+         self.ImportCount, self.ImportOffset,
+         self.DependsOffset) = reader.unpack("<5I")
 
 class FObjectExport():
     def __init__(self, reader):
-        self.ClassIndex = reader.s32()
-        self.SuperIndex = reader.s32()
-        self.TemplateIndex = reader.s32()
-        self.PackageIndex = reader.s32()
+        (self.ClassIndex, self.SuperIndex,
+         self.TemplateIndex, self.PackageIndex) = reader.unpack("<4i")
         self.ObjectName = FName(reader)
-        self.ObjectFlags = reader.u32()
-        self.SerialSize = reader.u64()
-        self.SerialOffset = reader.u64()
-        self.bForcedExport = reader.u32()
-        self.bNotForClient = reader.u32()
-        self.bNotForServer = reader.u32()
+        (self.ObjectFlags, self.SerialSize, self.SerialOffset,
+         self.bForcedExport, self.bNotForClient,
+         self.bNotForServer) = reader.unpack("<IQQ3I")
         self.Guid = FGuid(reader)
-        self.PackageFlags = reader.u32()
-        self.bNotForEditorGame = reader.u32()
-        self.bIsAsset = reader.u32()
+        (self.PackageFlags, self.bNotForEditorGame,
+         self.bIsAsset) = reader.unpack("<3I")
 
         if reader.Summary.VersionUE5 >= VER_UE5_OPTIONAL_RESOURCES:
             self.bGeneratePublicHash = reader.u32()
         else:
             self.bGeneratePublicHash = False
 
-        self.FirstExportDependency = reader.s32()
-        self.SerializationBeforeSerializationDependencies = reader.s32()
-        self.CreateBeforeSerializationDependencies = reader.s32()
-        self.SerializationBeforeCreateDependencies = reader.s32()
-        self.CreateBeforeCreateDependencies = reader.s32()
+        (self.FirstExportDependency,
+         self.SerializationBeforeSerializationDependencies,
+         self.CreateBeforeSerializationDependencies,
+         self.SerializationBeforeCreateDependencies,
+         self.CreateBeforeCreateDependencies) = reader.unpack("<5i")
 
 class FObjectImport():
     def __init__(self, reader):
@@ -224,16 +270,38 @@ class PackageTable():
         return len(self.table)
 
 class FPackageReader(BinaryReader):
-    def __init__(self, buffer, uexp_offset=None):
+    """
+    Reads a package from either one buffer holding the .uasset followed by
+    the .uexp, or from separate .uasset and .uexp buffers (e.g. mmaps). In the
+    latter case offsets past the end of the .uasset are routed to the .uexp
+    buffer and self.offset is relative to whichever buffer is current.
+    """
+    def __init__(self, buffer, uexp_offset=None, uexp=None):
         super().__init__(buffer)
 
-        self.uexp_offset = uexp_offset
+        self.uasset = buffer
+        self.uexp = uexp
+        self.base = 0
+
+        if uexp is not None:
+            self.uexp_offset = len(buffer)
+        else:
+            self.uexp_offset = uexp_offset
+
+        # Checked once per package so disabled debug output costs nothing
+        self.Trace = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        # Set by open_package_header(), whose buffer ends with the tables
+        self.HeaderOnly = False
 
         self.Summary = FPackageFileSummary(self)
 
         self.seek(self.Summary.NameOffset)
-        self.NameTable = PackageTable(self.array(FNameEntry,
-                                                 self.Summary.NameCount))
+        self.NameTable = PackageTable(FNameEntryArray(self,
+                                                      self.Summary.NameCount))
+
+        # Interned name strings shared by every FName in the package
+        self.Names = [entry.data for entry in self.NameTable]
 
         self.seek(self.Summary.ExportOffset)
         self.ExportTable = PackageTable(self.array(FObjectExport,
@@ -243,14 +311,44 @@ class FPackageReader(BinaryReader):
         self.ImportTable = PackageTable(self.array(FObjectImport,
                                                    self.Summary.ImportCount))
 
-    def array(self, type, count):
-        return [type(self) for _ in range(count)]
+        # Deserialized exports by export index, filled in on first access
+        self.Exports = {}
+
+        # Export indexes by name and by class name, built on first lookup
+        self.ExportNameIndex = None
+        self.ExportClassIndex = None
+
+    def __getstate__(self):
+        # Buffers are usually mmaps, which can't be pickled, see attach()
+        state = self.__dict__.copy()
+        state["buffer"] = state["uasset"] = state["uexp"] = None
+        return state
+
+    def attach(self, uasset, uexp=None):
+        """Attach the package buffers to a reader restored from a pickle."""
+        self.uasset = uasset
+        self.uexp = uexp
+        self.Trace = logging.getLogger().isEnabledFor(logging.DEBUG)
+        self.seek(0)
+
+    def seek(self, offset):
+        if self.uexp is not None and offset >= self.uexp_offset:
+            self.buffer = self.uexp
+            self.base = self.uexp_offset
+        else:
+            self.buffer = self.uasset
+            self.base = 0
+        self.offset = offset - self.base
+
+    def tell(self):
+        return self.base + self.offset
 
     def offset_string(self):
-        if self.uexp_offset is not None and self.offset >= self.uexp_offset:
-            return f"uexp:{self.offset - self.uexp_offset:08X}"
+        offset = self.tell()
+        if self.uexp_offset is not None and offset >= self.uexp_offset:
+            return f"uexp:{offset - self.uexp_offset:08X}"
         else:
-            return f"uasset:{self.offset:08X}"
+            return f"uasset:{offset:08X}"
 
     def ExIm(self, index):
         if index < 0:
@@ -259,6 +357,53 @@ class FPackageReader(BinaryReader):
             return self.ExportTable[index - 1]
         return None
 
+    def IndexExports(self):
+        self.ExportNameIndex = {}
+        self.ExportClassIndex = {}
+        for i, export in enumerate(self.ExportTable):
+            self.ExportNameIndex.setdefault(str(export.ObjectName), i + 1)
+            self.ExportClassIndex.setdefault(
+                self.GetObjectName(export.ClassIndex), []).append(i + 1)
+
+    def FindExport(self, name):
+        """Get the export index of the first export with a given name."""
+        if self.ExportNameIndex is None:
+            self.IndexExports()
+        return self.ExportNameIndex.get(str(name), 0)
+
+    def FindExportsOfClass(self, class_name):
+        """Get the export indexes of all exports with a given class name."""
+        if self.ExportClassIndex is None:
+            self.IndexExports()
+        return self.ExportClassIndex.get(str(class_name), [])
+
+    def ReadExport(self, index, memoize=True):
+        """
+        Deserialize an export given its export index or name. Exports are
+        only read on first access and memoized afterwards, unless memoize is
+        False so the caller holds the only reference.
+        """
+        if self.HeaderOnly:
+            raise RuntimeError("Can't read exports of a package opened header "
+                               "only, use open_package() instead")
+
+        if isinstance(index, str) or isinstance(index, FName):
+            if (index := self.FindExport(index)) == 0:
+                return None
+
+        if index in self.Exports:
+            return self.Exports[index]
+
+        # ue4.properties depends on this module
+        from .properties import read_export
+
+        offset = self.tell()
+        obj = read_export(self, index)
+        if memoize:
+            self.Exports[index] = obj
+        self.seek(offset)
+        return obj
+
     def IsFilterEditorOnly(self):
         return (self.Summary.PackageFlags & PKG_FilterEditorOnly) != 0
 
@@ -299,22 +444,45 @@ class FPackageReader(BinaryReader):
                 name += f" : {self.GetObjectPath(export.TemplateIndex)}"
         return name
 
-class FName(UserString):
+class FName():
+    """
+    Name table index and number. The string is only built when needed, and
+    names without a number share the package's name table string. FNames
+    hash and compare equal to their strings.
+    """
+    __slots__ = ("Index", "ExtraIndex", "Names")
+
     def __init__(self, reader):
-        match reader:
-            case FPackageReader():
-                self.Index = reader.u32()
-                self.ExtraIndex = reader.u32()
-                self.data = reader.NameTable[self.Index]
-                if self.ExtraIndex != 0:
-                    self.data += f"_{self.ExtraIndex - 1}"
-            case _:
-                self.Index = None
-                self.ExtraIndex = None
-                super().__init__(reader)
+        self.Index, self.ExtraIndex = reader.unpack("<II")
+        self.Names = reader.Names
+        if self.Index >= len(self.Names):
+            raise IndexError("name index out of range",
+                             f"index {self.Index}/{len(self.Names) - 1}")
+
+    def __str__(self):
+        if self.ExtraIndex == 0:
+            return self.Names[self.Index]
+        return f"{self.Names[self.Index]}_{self.ExtraIndex - 1}"
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
 
     def __hash__(self):
-        return hash(self.data)
+        return hash(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, FName):
+            if (self.Names is other.Names and self.Index == other.Index and
+                    self.ExtraIndex == other.ExtraIndex):
+                return True
+            other = str(other)
+        return str(self) == other
+
+    def __lt__(self, other):
+        return str(self) < str(other)
 
 class FNameEntry(UserString):
     def __init__(self, reader):
@@ -328,6 +496,45 @@ class FNameEntry(UserString):
                 self.CasePreservingHash = None
                 super().__init__(reader)
 
+def FNameEntryArray(reader, count):
+    """
+    Read count name table entries in one loop. Equivalent to
+    reader.array(FNameEntry, count) but several times faster, which matters
+    when only package headers are read.
+    """
+    buffer = reader.buffer
+    offset = reader.offset
+    entries = []
+    for _ in range(count):
+        (length,) = S32.unpack_from(buffer, offset)
+        offset += 4
+        if length >= 0:
+            data = buffer[offset:offset + length][:-1].decode()
+            offset += length
+        else:
+            data = buffer[offset:offset - length * 2][:-1].decode("utf-16",
+                                                                  "ignore")
+            offset -= length * 2
+
+        entry = FNameEntry.__new__(FNameEntry)
+        entry.data = data
+        (entry.NonCasePreservingHash,
+         entry.CasePreservingHash) = NAME_HASHES.unpack_from(buffer, offset)
+        offset += 4
+        entries.append(entry)
+
+    reader.offset = offset
+    return entries
+
+def FNameString(reader):
+    """
+    Read an FName as a plain string, shared with the name table if possible.
+    """
+    Index, ExtraIndex = reader.unpack("<II")
+    if ExtraIndex == 0:
+        return reader.Names[Index]
+    return f"{reader.Names[Index]}_{ExtraIndex - 1}"
+
 def FString(reader):
     length = reader.s32()
     if length >= 0:
@@ -1,33 +1,34 @@
 #!/bin/bash
 dir="$1/Equippables/Guns"
-dump="python asset_dump.py"
 
-$dump "$dir/_Core/Gun.uasset" \
-      "$dir/_Core/Gun_Sniper.uasset" \
-      "$dir/_Core/Gun_Zoomable.uasset" \
-      "$dir/_Core/Projectile_Gun.uasset"
+python asset_dump.py --jobs 0 --incremental --root "$dir" --manifest - <<'EOF'
+_Core/Gun.uasset
+_Core/Gun_Sniper.uasset
+_Core/Gun_Zoomable.uasset
+_Core/Projectile_Gun.uasset
 
-find "$dir/_Core" -type f -name 'Curve_*.uasset' -exec $dump {} +
-find "$dir/_Core" -type f -name 'Comp_Gun_*.uasset' -exec $dump {} +
-find "$dir/_Core/Curves" -type f -exec $dump {} +
-find "$dir/_Core/WallPenetration" -type f -name 'WallPen_*.uasset' -exec $dump {} +
+_Core/**/Curve_*.uasset
+_Core/**/Comp_Gun_*.uasset
+_Core/Curves
+_Core/WallPenetration/**/WallPen_*.uasset
 
-$dump "$dir/HvyMachineGuns/HMG/HeavyMachineGun.uasset" \
-      "$dir/HvyMachineGuns/LMG/LightMachineGun.uasset" \
-      "$dir/Rifles/AK/AssaultRifle_AK.uasset" \
-      "$dir/Rifles/Burst/AssaultRifle_Burst.uasset" \
-      "$dir/Rifles/Carbine/AssaultRifle_ACR.uasset" \
-      "$dir/Shotguns/AutoShotgun/AutomaticShotgun.uasset" \
-      "$dir/Shotguns/PumpShotgun/PumpShotgun.uasset" \
-      "$dir/Sidearms/AutoPistol/AutomaticPistol.uasset" \
-      "$dir/Sidearms/BasePistol/BasePistol.uasset" \
-      "$dir/Sidearms/Luger/LugerPistol.uasset" \
-      "$dir/Sidearms/Revolver/RevolverPistol.uasset" \
-      "$dir/Sidearms/Slim/SawedOffShotgun.uasset" \
-      "$dir/SniperRifles/Boltsniper/BoltSniper.uasset" \
-      "$dir/SniperRifles/DMR/DMR.uasset" \
-      "$dir/SniperRifles/Leversniper/LeverSniperRifle.uasset" \
-      "$dir/SubMachineGuns/MP5/SubMachineGun_MP5.uasset" \
-      "$dir/SubMachineGuns/Vector/Vector.uasset"
+HvyMachineGuns/HMG/HeavyMachineGun.uasset
+HvyMachineGuns/LMG/LightMachineGun.uasset
+Rifles/AK/AssaultRifle_AK.uasset
+Rifles/Burst/AssaultRifle_Burst.uasset
+Rifles/Carbine/AssaultRifle_ACR.uasset
+Shotguns/AutoShotgun/AutomaticShotgun.uasset
+Shotguns/PumpShotgun/PumpShotgun.uasset
+Sidearms/AutoPistol/AutomaticPistol.uasset
+Sidearms/BasePistol/BasePistol.uasset
+Sidearms/Luger/LugerPistol.uasset
+Sidearms/Revolver/RevolverPistol.uasset
+Sidearms/Slim/SawedOffShotgun.uasset
+SniperRifles/Boltsniper/BoltSniper.uasset
+SniperRifles/DMR/DMR.uasset
+SniperRifles/Leversniper/LeverSniperRifle.uasset
+SubMachineGuns/MP5/SubMachineGun_MP5.uasset
+SubMachineGuns/Vector/Vector.uasset
 
-find "$dir" -type f -name 'Projectile_*.uasset' -exec $dump {} +
\ No newline at end of file
+**/Projectile_*.uasset
+EOF
@@ -1,6 +1,6 @@
 #!/bin/bash
 dir="$1/Equippables/Guns"
-dump="python gun_dump.py"
+dump="python gun_dump.py --jobs 0 --incremental"
 
 $dump "$dir/HvyMachineGuns/HMG/HeavyMachineGun.uasset" \
       "$dir/HvyMachineGuns/LMG/LightMachineGun.uasset" \